@@ -0,0 +1,135 @@
+"""
+Command-line runner for registered problems.
+
+    python -m src list
+    python -m src run p2_1_6 --samples 100 --trials 10000 --seed 1 --workers 4 --backend antithetic
+    python -m src run p1_1_4 --mode exact -p winning_score=11
+    python -m src run thorough_frog --mode simulate --seed 1 --samples 200 --cache
+    python -m src run p4_1_20 --mode simulate --samples 1000 --checkpoint urn.ckpt --resume
+"""
+
+import argparse
+import ast
+
+from typing import Any, Dict, List, Optional
+
+from src.registry import PROBLEMS, Problem, get_problem, load_entry
+from src.utils.cache import code_version, get_default_cache, make_key
+
+
+def parse_params(pairs: List[str]) -> Dict[str, Any]:
+    """Parse `key=value` problem parameters, reading values as Python literals where possible."""
+    params = {}
+    for pair in pairs:
+        key, _, value = pair.partition("=")
+        try:
+            params[key] = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            params[key] = value
+    return params
+
+
+def run(args: argparse.Namespace, problem: Problem):
+    params = parse_params(args.param)
+    modes = ["simulate", "exact"] if args.mode == "both" else [args.mode]
+
+    for mode in modes:
+        if getattr(problem, mode) is None:
+            if args.mode != "both":
+                raise SystemExit(f"{problem.name} has no {mode} entry point")
+            continue
+
+        kwargs = dict(params)
+        entry = load_entry(problem=problem, entry=mode)
+        if mode == "simulate":
+            if args.backend is not None:
+                if args.backend not in problem.backends:
+                    raise SystemExit(
+                        f"{problem.name} supports backends {problem.backends}"
+                    )
+                if len(problem.backends) > 1:
+                    kwargs["backend"] = args.backend
+            if args.samples is not None:
+                kwargs["num_samples"] = args.samples
+            if args.trials is not None:
+                kwargs["trials_per_sample"] = args.trials
+            kwargs["seed"] = args.seed
+            kwargs["workers"] = args.workers
+            if args.cache:
+                if args.seed is None:
+                    raise SystemExit("--cache requires --seed")
+                kwargs["cache"] = get_default_cache()
+                kwargs["cache_key"] = make_key(
+                    problem=problem.name,
+                    params={**params, "backend": args.backend},
+                    version=code_version(entry),
+                )
+
+            if args.checkpoint is not None:
+                kwargs["checkpoint_path"] = args.checkpoint
+                kwargs["resume"] = args.resume
+
+        res = entry(**kwargs)
+        print(f"{problem.name} {mode}: {res}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="python -m src")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("list", help="list registered problems")
+
+    run_parser = subparsers.add_parser("run", help="run a problem by name")
+    run_parser.add_argument("name")
+    run_parser.add_argument(
+        "--mode", choices=["simulate", "exact", "both"], default="both"
+    )
+    run_parser.add_argument("--samples", type=int, help="number of samples")
+    run_parser.add_argument("--trials", type=int, help="trials per sample")
+    run_parser.add_argument("--seed", type=int)
+    run_parser.add_argument(
+        "--workers", type=int, default=1, help="processes (0 for all cores)"
+    )
+    run_parser.add_argument("--backend")
+    run_parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="resume a seeded simulation from earlier runs' cached samples",
+    )
+    run_parser.add_argument("--checkpoint", help="file to checkpoint a simulation to")
+    run_parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="continue the simulation from its last checkpoint",
+    )
+    run_parser.add_argument(
+        "-p",
+        "--param",
+        action="append",
+        default=[],
+        help="problem parameter as key=value",
+    )
+
+    args = parser.parse_args(argv)
+    if args.command == "list":
+        for problem in PROBLEMS:
+            entries = [e for e in ("simulate", "exact") if getattr(problem, e)]
+            print(
+                f"{problem.name:<24} {problem.description} "
+                f"[{', '.join(entries)}; backends: {', '.join(problem.backends)}]"
+            )
+    else:
+        try:
+            problem = get_problem(args.name)
+        except KeyError:
+            run_parser.error(
+                f"unknown problem {args.name!r}, expected one of: "
+                + ", ".join(known.name for known in PROBLEMS)
+            )
+        if args.workers == 0:
+            args.workers = None
+        run(args, problem=problem)
+
+
+if __name__ == "__main__":
+    main()
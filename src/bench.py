@@ -0,0 +1,382 @@
+"""
+Benchmark harness for the problem scripts.
+
+Runs every problem's simulation and exact solver as a named case with fixed seeds and sizes,
+recording wall time, trials/second, peak traced memory and error against the known answer,
+and writes the results as JSON so runs before and after a change can be compared:
+
+    python -m src.bench --output before.json
+    python -m src.bench --output after.json --compare before.json
+"""
+
+import argparse
+import functools
+import io
+import json
+import math
+import operator
+import platform
+import time
+import tracemalloc
+
+import numpy as np
+
+from contextlib import redirect_stderr, redirect_stdout
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from src.ch1 import p1_1_4
+from src.ch2 import p2_1_3, p2_1_4, p2_1_6, p2_1_7
+from src.ch3 import p3_1_20
+from src.ch4 import p4_1_20
+from src.other import (
+    bertrand_ballot,
+    cube_painting,
+    dominated_turtle,
+    egg_drop,
+    gamblers_ruin,
+    jug_problem,
+    singular_matrix_process,
+    six_card_sum,
+    thorough_frog,
+)
+from src.utils.binom import binom, log_binom
+from src.utils.pouring import PouringPuzzle
+
+
+SEED = 0
+
+
+class BenchCase(NamedTuple):
+    name: str
+    run: Callable[[], float]
+    expected: float
+    trials: Optional[int] = None
+
+
+def _sim_case(
+    name: str, simulate: Callable, expected: float, num_samples: int, trials: int
+) -> BenchCase:
+    return BenchCase(
+        name=name,
+        run=lambda: simulate(
+            num_samples=num_samples, trials_per_sample=trials, seed=SEED, workers=1
+        ).mean,
+        expected=expected,
+        trials=num_samples * trials,
+    )
+
+
+def _ruin_closed_form(n: int, k: int, p: float) -> float:
+    # hitting time theorem: P(first hit 0 at t) = (n / t) P(S_t = -n)
+    t = n + 2 * k
+    return n / t * binom(n=t, k=k) * p**k * (1 - p) ** (n + k)
+
+
+def _guessing_value(ranks: int, per_rank: int) -> float:
+    # optimal expected correct guesses by the plain value recursion over sorted counts: guess a most
+    # numerous rank, then average over the card drawn
+    @functools.lru_cache(maxsize=None)
+    def value(counts: Tuple[int, ...]) -> float:
+        total = sum(counts)
+        if total == 0:
+            return 0.0
+        res = max(counts) / total
+        for i, count in enumerate(counts):
+            if count:
+                child = counts[:i] + (count - 1,) + counts[i + 1 :]
+                res += count / total * value(tuple(sorted(child)))
+        return res
+
+    return value((per_rank,) * ranks)
+
+
+CASES: List[BenchCase] = [
+    _sim_case("p1_1_4.simulate", p1_1_4.simulate, p1_1_4.exact(), 100, 100),
+    BenchCase("p1_1_4.exact", p1_1_4.exact, 0.8260938620870539),
+    # 199 x 199 surface over serve-win probs 0.005, ..., 0.995; point (0.6, 0.5)
+    BenchCase(
+        "p1_1_4.sweep",
+        lambda: p1_1_4.sweep(
+            np.linspace(0, 1, 201)[1:-1, None], np.linspace(0, 1, 201)[None, 1:-1]
+        )[119, 99],
+        0.8260938620870539,
+    ),
+    _sim_case("p2_1_3.simulate", p2_1_3.simulate, math.pi, 100, 10000),
+    BenchCase(
+        "p2_1_3.simulate_qmc",
+        lambda: p2_1_3.simulate_qmc(seed=SEED).mean,
+        math.pi,
+        trials=16 * (1 << 16),
+    ),
+    _sim_case("p2_1_4.simulate", p2_1_4.simulate, math.pi, 100, 10000),
+    BenchCase(
+        "p2_1_4.simulate_qmc",
+        lambda: p2_1_4.simulate_qmc(seed=SEED).mean,
+        math.pi,
+        trials=16 * (1 << 12),
+    ),
+    _sim_case("p2_1_6.simulate", p2_1_6.simulate, math.pi, 100, 10000),
+    _sim_case("p2_1_7.simulate", p2_1_7.simulate, math.pi, 100, 10000),
+    _sim_case("p3_1_20.simulate", p3_1_20.simulate, 29926 / 362880, 20, 100),
+    # exact solvers are timed uncached, so repeated runs measure the computation
+    BenchCase(
+        "p3_1_20.exact_brute",
+        lambda: operator.truediv(*p3_1_20.count_good_seatings_brute.uncached()),
+        29926 / 362880,
+    ),
+    BenchCase("p3_1_20.exact", p3_1_20.exact, 29926 / 362880),
+    # limiting white proportion of a Polya urn is Uniform(0, 1): E[max(U, 1 - U)] = 3/4
+    _sim_case("p4_1_20.simulate", p4_1_20.simulate, 3 / 4, 10, 10),
+    BenchCase(
+        "bertrand_ballot.exact_dp",
+        lambda: bertrand_ballot.bertrand_ballot_dp(
+            n=bertrand_ballot.N, m=bertrand_ballot.M
+        ),
+        bertrand_ballot.bertrand_ballot_closed_form(
+            n=bertrand_ballot.N, m=bertrand_ballot.M
+        ),
+    ),
+    BenchCase(
+        "bertrand_ballot.exact",
+        bertrand_ballot.exact,
+        bertrand_ballot.bertrand_ballot_closed_form(
+            n=bertrand_ballot.N, m=bertrand_ballot.M
+        ),
+    ),
+    # C(2*10^6, 10^6) by the factored product; C(10^9, 2000) must not sieve up to 10^9
+    BenchCase(
+        "binom.factored",
+        lambda: math.log(binom(n=2 * 10**6, k=10**6)),
+        log_binom(2 * 10**6, 10**6),
+    ),
+    BenchCase(
+        "binom.huge_n",
+        lambda: math.log(binom(n=10**9, k=2000)),
+        log_binom(10**9, 2000),
+    ),
+    # proper 6-colorings of the cube's face graph (octahedron): k(k-1)(k-2)(k^3-9k^2+29k-32) = 4080
+    BenchCase(
+        "cube_painting.exact_brute",
+        lambda: operator.truediv(*cube_painting.count_paintings_brute.uncached()),
+        1 - 4080 / 6**6,
+    ),
+    BenchCase("cube_painting.exact", cube_painting.exact, 1 - 4080 / 6**6),
+    # k = 2..100 colors on three face graphs; checked at k = 6
+    BenchCase(
+        "cube_painting.sweep",
+        lambda: float(
+            sum(
+                cube_painting.shared_edge_probabilities(poly=poly)[6]
+                for poly in cube_painting.platonic_solids().values()
+                if poly.name in ("cube", "dodecahedron", "icosahedron")
+            )
+        ),
+        3 - 4080 / 6**6 - 4012560 / 6**12 - 15108392957760 / 6**20,
+    ),
+    BenchCase(
+        "dominated_turtle.exact_brute", dominated_turtle.exact_brute, 49104 / 4**10
+    ),
+    BenchCase("dominated_turtle.exact", dominated_turtle.exact, 49104 / 4**10),
+    BenchCase(
+        "dominated_turtle.curve",
+        lambda: float(dominated_turtle.dominated_probabilities(max_moves=2000)[10]),
+        49104 / 4**10,
+    ),
+    BenchCase(
+        "egg_drop.exact_dp",
+        lambda: egg_drop.egg_drop_table.uncached(
+            eggs=egg_drop.EGGS, floors=egg_drop.FLOORS - 1
+        )[egg_drop.EGGS][egg_drop.FLOORS - 1][1],
+        10,
+    ),
+    BenchCase("egg_drop.exact", egg_drop.exact, 10),
+    BenchCase(
+        "egg_drop.min_drops", lambda: egg_drop.min_drops(eggs=64, floors=10**9), 30
+    ),
+    BenchCase(
+        "gamblers_ruin.exact_dp",
+        lambda: gamblers_ruin.gamblers_ruin_dp(
+            n=gamblers_ruin.N, k=gamblers_ruin.K, p=gamblers_ruin.P
+        ),
+        _ruin_closed_form(n=gamblers_ruin.N, k=gamblers_ruin.K, p=gamblers_ruin.P),
+    ),
+    BenchCase(
+        "gamblers_ruin.exact",
+        gamblers_ruin.exact,
+        _ruin_closed_form(n=gamblers_ruin.N, k=gamblers_ruin.K, p=gamblers_ruin.P),
+    ),
+    # ruin-time distribution over 10^6 steps for a fair and a losing game: P(ruin by T) ~= 1 - n sqrt(2 / (pi T)) when fair
+    BenchCase(
+        "gamblers_ruin.first_passage",
+        lambda: float(
+            gamblers_ruin.first_passage_probs(
+                n=gamblers_ruin.N, p=np.array([0.5, 0.4]), horizon=10**6
+            ).sum()
+        ),
+        2 - gamblers_ruin.N * math.sqrt(2 / (math.pi * 10**6)),
+    ),
+    BenchCase("jug_problem.exact", lambda: len(jug_problem.solve()) - 1, 17),
+    BenchCase(
+        "pouring.bidirectional_search",
+        lambda: len(
+            PouringPuzzle(capacities=(3000, 5, 7, 11, 13)).bidirectional_search(
+                start=(3000, 0, 0, 0, 0),
+                goals=[(barrel, 1, 1, 1, 1) for barrel in range(3000 - 3)],
+            )
+        )
+        - 1,
+        15,
+    ),
+    _sim_case(
+        "singular_matrix_process.simulate",
+        singular_matrix_process.simulate,
+        12 / 7,
+        100,
+        100,
+    ),
+    BenchCase("singular_matrix_process.exact", singular_matrix_process.exact, 12 / 7),
+    # a singular start is absorbed at once
+    BenchCase(
+        "singular_matrix_process.exact_absorbed",
+        lambda: singular_matrix_process.exact(start=(1, 1, 1, 1)),
+        0,
+    ),
+    BenchCase(
+        "six_card_sum.exact_dp",
+        lambda: six_card_sum.solve_dp(aces=six_card_sum.ACES, jacks=six_card_sum.JACKS),
+        4.1,
+    ),
+    BenchCase("six_card_sum.exact", six_card_sum.exact, 4.1),
+    # 52-card deck: mean of the payoff distribution against a separate value recursion
+    BenchCase(
+        "six_card_sum.deck",
+        lambda: float(
+            np.arange(53) @ six_card_sum.solve_guessing(counts=[4] * 13).distribution
+        ),
+        _guessing_value(ranks=13, per_rank=4),
+    ),
+    # on a cycle of N nodes, P(all visited when first reaching any fixed target) = 1/(N-1);
+    # 2000 trials (~20 hits) so the estimate is resolved from 0
+    _sim_case(
+        "thorough_frog.simulate",
+        thorough_frog.simulate,
+        1 / (thorough_frog.N - 1),
+        20,
+        100,
+    ),
+    BenchCase(
+        "thorough_frog.simulate_batch",
+        lambda: thorough_frog.simulate(
+            num_samples=2,
+            trials_per_sample=10000,
+            seed=SEED,
+            workers=1,
+            backend="batch",
+        ).mean,
+        1 / (thorough_frog.N - 1),
+        trials=2 * 10000,
+    ),
+    BenchCase(
+        "thorough_frog.exact",
+        lambda: thorough_frog.exact(n=10**4, target=10**4 // 2),
+        1 / (10**4 - 1),
+    ),
+]
+
+
+def run_case(
+    case: BenchCase, repeat: Optional[int] = 1, measure_memory: Optional[bool] = True
+) -> Dict[str, Any]:
+    """Run `case` (silencing its output), keeping the best wall time over `repeat` runs.
+    Peak memory is measured in one extra run under `tracemalloc`, so tracing does not skew timings.
+
+    Args:
+        case (BenchCase): Case to run.
+        repeat (Optional[int], optional): Number of timed runs. Defaults to 1.
+        measure_memory (Optional[bool], optional): Whether to measure peak traced memory. Defaults to `True`.
+
+    Returns:
+        Dict[str, Any]: JSON-serializable result record.
+    """
+    wall_time = math.inf
+    with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            value = float(case.run())
+            wall_time = min(wall_time, time.perf_counter() - start)
+
+        peak_memory = None
+        if measure_memory:
+            tracemalloc.start()
+            case.run()
+            _, peak_memory = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+    return {
+        "name": case.name,
+        "value": value,
+        "expected": case.expected,
+        "abs_error": abs(value - case.expected),
+        "wall_time": wall_time,
+        "trials": case.trials,
+        "trials_per_sec": case.trials / wall_time if case.trials else None,
+        "peak_memory": peak_memory,
+    }
+
+
+def compare(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]]):
+    """Print per-case speedup and error change of `results` relative to `baseline`."""
+    baseline_by_name = {res["name"]: res for res in baseline}
+    for res in results:
+        base = baseline_by_name.get(res["name"])
+        if base is None:
+            print(f"{res['name']}: new case")
+            continue
+        print(
+            f"{res['name']}: speedup={base['wall_time'] / res['wall_time']:.2f}x, "
+            f"abs_error {base['abs_error']:.3g} -> {res['abs_error']:.3g}"
+        )
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "-k", "--filter", default="", help="only run cases containing this"
+    )
+    parser.add_argument("-o", "--output", default="bench_results.json")
+    parser.add_argument("--compare", help="baseline results file to compare against")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--no-memory", action="store_true")
+    args = parser.parse_args(argv)
+
+    results = []
+    for case in CASES:
+        if args.filter not in case.name:
+            continue
+        res = run_case(case=case, repeat=args.repeat, measure_memory=not args.no_memory)
+        results.append(res)
+        print(
+            f"{res['name']}: {res['wall_time']:.4f}s, value={res['value']}, "
+            f"abs_error={res['abs_error']:.3g}, peak_memory={res['peak_memory']}"
+        )
+
+    with open(args.output, "w") as f:
+        json.dump(
+            {
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "seed": SEED,
+                "results": results,
+            },
+            f,
+            indent=2,
+        )
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results=results, baseline=json.load(f)["results"])
+
+
+if __name__ == "__main__":
+    main()
@@ -11,12 +11,20 @@ win a game.
 
 import random
 
-from utils.sim import run_sims_and_report
+import numpy as np
+
+from typing import List, Optional, Sequence, Tuple, Union
+
+from src.utils.absorbing import build_chain, solve_from
+from src.utils.chains import ChainState, run_chains
+from src.utils.sim import run_sims_and_report
+from src.utils.stats import RunningStats
 
 
 WINNING_SCORE = 21
 P1_SERVE_WIN_PROB = 0.6
 P2_SERVE_WIN_PROB = 0.5
+WIN_BY = 1
 
 
 """
@@ -24,29 +32,117 @@ P2_SERVE_WIN_PROB = 0.5
 """
 
 
-def play_game() -> int:
+def play_game(
+    winning_score: Optional[int] = WINNING_SCORE,
+    p1_serve_win_prob: Optional[float] = P1_SERVE_WIN_PROB,
+    p2_serve_win_prob: Optional[float] = P2_SERVE_WIN_PROB,
+    win_by: Optional[int] = WIN_BY,
+    rally_scoring: Optional[bool] = False,
+) -> int:
+    """Play one game: first to `winning_score` with a lead of at least `win_by` wins.
+    With `rally_scoring`, the receiver also scores on winning a volley.
+    """
     p1_score, p2_score = 0, 0
     is_p1_serving = True
-    while p1_score < WINNING_SCORE and p2_score < WINNING_SCORE:
+    while max(p1_score, p2_score) < winning_score or abs(p1_score - p2_score) < win_by:
         r = random.random()
         if is_p1_serving:
-            if r < P1_SERVE_WIN_PROB:
+            if r < p1_serve_win_prob:
                 p1_score += 1
             else:
                 is_p1_serving = False
+                p2_score += rally_scoring
         else:
-            if r < P2_SERVE_WIN_PROB:
+            if r < p2_serve_win_prob:
                 p2_score += 1
             else:
                 is_p1_serving = True
-    return 1 if p1_score == WINNING_SCORE else 2
+                p1_score += rally_scoring
+    return 1 if p1_score > p2_score else 2
+
+
+def play_games(
+    rng: np.random.Generator,
+    n: int,
+    winning_score: Optional[int] = WINNING_SCORE,
+    p1_serve_win_prob: Optional[float] = P1_SERVE_WIN_PROB,
+    p2_serve_win_prob: Optional[float] = P2_SERVE_WIN_PROB,
+    win_by: Optional[int] = WIN_BY,
+    rally_scoring: Optional[bool] = False,
+) -> np.ndarray:
+    """Vectorized `play_game()` over `n` independent games: `True` iff P1 wins."""
+
+    def rally(rng: np.random.Generator, state: ChainState) -> ChainState:
+        is_p1_serving = state["is_p1_serving"]
+        server_wins = rng.random(len(is_p1_serving)) < np.where(
+            is_p1_serving, p1_serve_win_prob, p2_serve_win_prob
+        )
+        p1_wins = server_wins == is_p1_serving
+        scores = server_wins | rally_scoring
+        return {
+            "p1_score": state["p1_score"] + (scores & p1_wins),
+            "p2_score": state["p2_score"] + (scores & ~p1_wins),
+            "is_p1_serving": p1_wins,
+        }
+
+    def is_done(state: ChainState) -> np.ndarray:
+        p1_score, p2_score = state["p1_score"], state["p2_score"]
+        return (np.maximum(p1_score, p2_score) >= winning_score) & (
+            np.abs(p1_score - p2_score) >= win_by
+        )
+
+    res = run_chains(
+        rng=rng,
+        init={
+            "p1_score": np.zeros(n, dtype=np.int64),
+            "p2_score": np.zeros(n, dtype=np.int64),
+            "is_p1_serving": np.ones(n, dtype=bool),
+        },
+        step=rally,
+        is_done=is_done,
+    )
+    return res.state["p1_score"] > res.state["p2_score"]
 
 
-run_sims_and_report(
-    fn=lambda: play_game() == 1,
-    num_samples=1000,
-    trials_per_sample=1000,
-)
+def simulate(
+    num_samples: Optional[int] = 1000,
+    trials_per_sample: Optional[int] = 1000,
+    seed: Optional[int] = None,
+    workers: Optional[int] = 1,
+    winning_score: Optional[int] = WINNING_SCORE,
+    p1_serve_win_prob: Optional[float] = P1_SERVE_WIN_PROB,
+    p2_serve_win_prob: Optional[float] = P2_SERVE_WIN_PROB,
+    win_by: Optional[int] = WIN_BY,
+    rally_scoring: Optional[bool] = False,
+    backend: Optional[str] = "batch",
+    **sim_kwargs,
+) -> RunningStats:
+    """Estimate probability P1 wins by simulating games.
+
+    Backend `"batch"` plays the games as vectorized chains, `"scalar"` one rally at a time.
+
+    @see `run_sims_and_report()`
+    """
+    game = dict(
+        winning_score=winning_score,
+        p1_serve_win_prob=p1_serve_win_prob,
+        p2_serve_win_prob=p2_serve_win_prob,
+        win_by=win_by,
+        rally_scoring=rally_scoring,
+    )
+    return run_sims_and_report(
+        fn=(lambda: play_game(**game) == 1) if backend == "scalar" else None,
+        batch_fn=(
+            (lambda rng, n: play_games(rng=rng, n=n, **game))
+            if backend == "batch"
+            else None
+        ),
+        num_samples=num_samples,
+        trials_per_sample=trials_per_sample,
+        seed=seed,
+        workers=workers,
+        **sim_kwargs,
+    )
 
 
 """
@@ -59,23 +155,248 @@ run_sims_and_report(
 # prob_p1[i][j] = 0.6*prob_p1[i+1][j] + (1-0.6)*prob_p2[i][j]
 # prob_p2[i][j] = 0.5*prob_p2[i][j+1] + (1-0.5)*prob_p1[i][j]
 
-prob_p1 = [[0.0 for _ in range(WINNING_SCORE + 1)] for _ in range(WINNING_SCORE + 1)]
-prob_p2 = [[0.0 for _ in range(WINNING_SCORE + 1)] for _ in range(WINNING_SCORE + 1)]
 
-for losing_score in range(0, WINNING_SCORE):
-    prob_p1[WINNING_SCORE][losing_score] = 1.0
-    prob_p2[WINNING_SCORE][losing_score] = 1.0
+def solve_dp(
+    winning_score: Optional[int] = WINNING_SCORE,
+    p1_serve_win_prob: Optional[float] = P1_SERVE_WIN_PROB,
+    p2_serve_win_prob: Optional[float] = P2_SERVE_WIN_PROB,
+) -> Tuple[List[List[float]], List[List[float]]]:
+    """Fill `(prob_p1, prob_p2)` tables by the solved recurrences above.
+
+    Returns:
+        Tuple[List[List[float]], List[List[float]]]: `(prob_p1, prob_p2)`; `prob_p1[0][0]` is P(P1 wins game).
+    """
+    prob_p1 = [
+        [0.0 for _ in range(winning_score + 1)] for _ in range(winning_score + 1)
+    ]
+    prob_p2 = [
+        [0.0 for _ in range(winning_score + 1)] for _ in range(winning_score + 1)
+    ]
 
-mult = 1 / (1 - (1 - P1_SERVE_WIN_PROB) * (1 - P2_SERVE_WIN_PROB))
-for i in range(WINNING_SCORE - 1, -1, -1):
-    for j in range(WINNING_SCORE - 1, -1, -1):
-        prob_p1[i][j] = mult * (
-            P1_SERVE_WIN_PROB * prob_p1[i + 1][j]
-            + (1 - P1_SERVE_WIN_PROB) * P2_SERVE_WIN_PROB * prob_p2[i][j + 1]
+    for losing_score in range(0, winning_score):
+        prob_p1[winning_score][losing_score] = 1.0
+        prob_p2[winning_score][losing_score] = 1.0
+
+    mult = 1 / (1 - (1 - p1_serve_win_prob) * (1 - p2_serve_win_prob))
+    for i in range(winning_score - 1, -1, -1):
+        for j in range(winning_score - 1, -1, -1):
+            prob_p1[i][j] = mult * (
+                p1_serve_win_prob * prob_p1[i + 1][j]
+                + (1 - p1_serve_win_prob) * p2_serve_win_prob * prob_p2[i][j + 1]
+            )
+            prob_p2[i][j] = mult * (
+                p2_serve_win_prob * prob_p2[i][j + 1]
+                + (1 - p2_serve_win_prob) * p1_serve_win_prob * prob_p1[i + 1][j]
+            )
+
+    return prob_p1, prob_p2
+
+
+def exact(
+    winning_score: Optional[int] = WINNING_SCORE,
+    p1_serve_win_prob: Optional[float] = P1_SERVE_WIN_PROB,
+    p2_serve_win_prob: Optional[float] = P2_SERVE_WIN_PROB,
+    win_by: Optional[int] = WIN_BY,
+    rally_scoring: Optional[bool] = False,
+) -> float:
+    if win_by != 1 or rally_scoring:
+        return float(
+            sweep(
+                p1_serve_win_probs=p1_serve_win_prob,
+                p2_serve_win_probs=p2_serve_win_prob,
+                winning_scores=winning_score,
+                win_by=win_by,
+                rally_scoring=rally_scoring,
+            )
         )
-        prob_p2[i][j] = mult * (
-            P2_SERVE_WIN_PROB * prob_p2[i][j + 1]
-            + (1 - P2_SERVE_WIN_PROB) * P1_SERVE_WIN_PROB * prob_p1[i + 1][j]
+    prob_p1, _ = solve_dp(
+        winning_score=winning_score,
+        p1_serve_win_prob=p1_serve_win_prob,
+        p2_serve_win_prob=p2_serve_win_prob,
+    )
+    return prob_p1[0][0]
+
+
+"""
+======== vectorized parameter sweep ========
+"""
+
+# In "points needed" coordinates `(a, b) = (winning_score - p1_score, winning_score - p2_score)` the
+# recurrence does not depend on `winning_score`, so one backward pass over `a, b <= max(winning_scores)`
+# answers every winning score at once, read off the diagonal `a = b`.
+# Once both players are within `win_by` of winning (`max(a, b) <= win_by`), the game only depends
+# on P1's lead `d = b - a`, and ends at `|d| >= win_by`: the "deuce" states form a small cycle,
+# solved as a batched linear system.
+
+
+def _deuce_probs(
+    p1: np.ndarray, p2: np.ndarray, win_by: int, rally_scoring: bool
+) -> Tuple[np.ndarray, np.ndarray]:
+    """P(P1 wins) from each deuce state, given P1/P2 serving.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: `(g1, g2)` of shape `(2 * win_by - 1, *p1.shape)`, indexed by `d + win_by - 1`.
+    """
+    k = 2 * win_by - 1
+    a = np.zeros(p1.shape + (2 * k, 2 * k))
+    rhs = np.zeros(p1.shape + (2 * k,))
+
+    def idx(d: int, is_p1_serving: bool) -> int:
+        return d + win_by - 1 + (0 if is_p1_serving else k)
+
+    def add(row: int, d: int, is_p1_serving: bool, prob: np.ndarray):
+        """Move `prob` of the `row` state's mass to deuce state `d` (or its terminal outcome)."""
+        if d >= win_by:
+            rhs[..., row] += prob
+        elif d > -win_by:
+            a[..., row, idx(d, is_p1_serving)] -= prob
+
+    for d in range(-win_by + 1, win_by):
+        for is_p1_serving, p_serve, won in [(True, p1, 1), (False, p2, -1)]:
+            row = idx(d, is_p1_serving)
+            a[..., row, row] += 1
+            add(row, d + won, is_p1_serving, p_serve)
+            add(row, d - won if rally_scoring else d, not is_p1_serving, 1 - p_serve)
+
+    g = np.linalg.solve(a, rhs[..., None])[..., 0]
+    g = np.moveaxis(g, -1, 0)
+    return g[:k], g[k:]
+
+
+def sweep(
+    p1_serve_win_probs: Union[float, np.ndarray] = P1_SERVE_WIN_PROB,
+    p2_serve_win_probs: Union[float, np.ndarray] = P2_SERVE_WIN_PROB,
+    winning_scores: Union[int, Sequence[int]] = WINNING_SCORE,
+    win_by: Optional[int] = WIN_BY,
+    rally_scoring: Optional[bool] = False,
+    chunk_size: Optional[int] = 1 << 14,
+) -> np.ndarray:
+    """P(P1, serving first, wins game) over a whole grid of parameters in one vectorized backward pass.
+
+    ex. 1000x1000 surface: `sweep(p1s[:, None], p2s[None, :])`.
+
+    Args:
+        p1_serve_win_probs (Union[float, np.ndarray], optional): P1 serve-win probabilities; broadcast with `p2_serve_win_probs`.
+        p2_serve_win_probs (Union[float, np.ndarray], optional): P2 serve-win probabilities.
+        winning_scores (Union[int, Sequence[int]], optional): Winning score(s). Defaults to `WINNING_SCORE`.
+        win_by (Optional[int], optional): Lead needed to win. Defaults to 1.
+        rally_scoring (Optional[bool], optional): Receiver also scores on winning a volley. Defaults to `False` (side-out).
+        chunk_size (Optional[int], optional): Grid points processed at a time, bounding memory. Defaults to 16384.
+
+    Returns:
+        np.ndarray: Win probabilities of shape `(len(winning_scores), *grid shape)`, or the grid shape for a single `winning_score`.
+    """
+    p1, p2 = np.broadcast_arrays(
+        np.asarray(p1_serve_win_probs, dtype=np.float64),
+        np.asarray(p2_serve_win_probs, dtype=np.float64),
+    )
+    scores = np.atleast_1d(winning_scores)
+    max_score = int(scores.max())
+    res = np.empty((len(scores), p1.size))
+
+    flat_p1, flat_p2 = p1.ravel(), p2.ravel()
+    # diagonals `a + b = s` of P(P1 wins | P1/P2 serving) at points needed `(a, b)`, indexed by `a`:
+    # each cell depends on `(a - 1, b)` and `(a, b - 1)` only, so diagonal `s` is a few in-place array
+    # ops on diagonal `s - 1`, with buffers reused across chunks
+    size = min(chunk_size, p1.size)
+    prev1, prev2, cur1, cur2, tmp = np.empty((5, max_score + 1, size))
+    for start in range(0, p1.size, chunk_size):
+        c1, c2 = (
+            flat_p1[start : start + chunk_size],
+            flat_p2[start : start + chunk_size],
         )
+        n = len(c1)
+        g1, g2 = _deuce_probs(p1=c1, p2=c2, win_by=win_by, rally_scoring=rally_scoring)
+        # f1(a, b) = w1 * f1(a - 1, b) + x1 * f2(a, b - 1), f2(a, b) = w2 * f2(a, b - 1) + x2 * f1(a - 1, b)
+        if rally_scoring:
+            w1, x1, w2, x2 = c1, 1 - c1, c2, 1 - c2
+        else:
+            mult = 1 / (1 - (1 - c1) * (1 - c2))
+            w1, x1 = mult * c1, mult * (1 - c1) * c2
+            w2, x2 = mult * c2, mult * (1 - c2) * c1
+
+        for s in range(2 * max_score + 1):
+            # fixed cells are set directly; the rest form at most two runs of `a`
+            runs: List[List[int]] = []
+            for a in range(max(0, s - max_score), min(s, max_score) + 1):
+                b = s - a
+                d = b - a
+                if max(a, b) > win_by and a > 0 and b > 0:
+                    if runs and runs[-1][1] == a - 1:
+                        runs[-1][1] = a
+                    else:
+                        runs.append([a, a])
+                elif (max(a, b) > win_by and a == 0) or d >= win_by:
+                    cur1[a, :n], cur2[a, :n] = 1, 1
+                elif max(a, b) > win_by or d <= -win_by:
+                    cur1[a, :n], cur2[a, :n] = 0, 0
+                else:
+                    cur1[a, :n], cur2[a, :n] = g1[d + win_by - 1], g2[d + win_by - 1]
+            for first, last in runs:
+                cells, below = slice(first, last + 1), slice(first - 1, last)
+                t = tmp[: last + 1 - first, :n]
+                np.multiply(w1, prev1[below, :n], out=cur1[cells, :n])
+                np.multiply(x1, prev2[cells, :n], out=t)
+                cur1[cells, :n] += t
+                np.multiply(w2, prev2[cells, :n], out=cur2[cells, :n])
+                np.multiply(x2, prev1[below, :n], out=t)
+                cur2[cells, :n] += t
+            if s % 2 == 0:
+                for i in np.flatnonzero(scores == s // 2):
+                    res[i, start : start + n] = cur1[s // 2, :n]
+            prev1, cur1 = cur1, prev1
+            prev2, cur2 = cur2, prev2
+
+    res = res.reshape((len(scores),) + p1.shape)
+    return res if np.ndim(winning_scores) else res[0]
+
+
+"""
+======== absorbing markov chain ========
+"""
+
+
+def solve_chain(
+    winning_score: Optional[int] = WINNING_SCORE,
+    p1_serve_win_prob: Optional[float] = P1_SERVE_WIN_PROB,
+    p2_serve_win_prob: Optional[float] = P2_SERVE_WIN_PROB,
+) -> Tuple[float, float]:
+    """Solve the game as an absorbing chain on `(p1_score, p2_score, is_p1_serving)`.
+
+    Returns:
+        Tuple[float, float]: P(P1 wins game), expected rallies in the game.
+    """
+
+    def rally(
+        state: Tuple[int, int, bool]
+    ) -> List[Tuple[Tuple[int, int, bool], float]]:
+        p1_score, p2_score, is_p1_serving = state
+        if is_p1_serving:
+            return [
+                ((p1_score + 1, p2_score, True), p1_serve_win_prob),
+                ((p1_score, p2_score, False), 1 - p1_serve_win_prob),
+            ]
+        return [
+            ((p1_score, p2_score + 1, False), p2_serve_win_prob),
+            ((p1_score, p2_score, True), 1 - p2_serve_win_prob),
+        ]
+
+    start = (0, 0, True)
+    chain = build_chain(
+        start=[start],
+        transitions=rally,
+        is_absorbing=lambda state: max(state[:2]) >= winning_score,
+    )
+    res = solve_from(chain=chain, starts=[start])
+    p1_wins = [state[0] == winning_score for state in chain.absorbing]
+    return (
+        float(res.probs[0, p1_wins].sum()),
+        float(res.expected_steps[0]),
+    )
+
 
-print(prob_p1[0][0])
+if __name__ == "__main__":
+    simulate()
+    print(exact())
+    prob_p1, rallies = solve_chain()
+    print(f"absorbing chain: P(P1 wins)={prob_p1}, expected rallies={rallies}")
@@ -7,25 +7,84 @@ at random. Compare your results with the true value of pi/4. Use your results
 to estimate the value of pi. How accurate is your estimate?
 """
 
-from typing import Tuple
+from typing import Optional, Tuple
 
-from utils.sim import choose_point, run_sims_and_report
+import numpy as np
+
+from src.utils.qmc import qmc_replicates, run_qmc_backend
+from src.utils.sim import choose_points, run_sims_and_report
+from src.utils.stats import RunningStats
 
 
 CENTER = (0.5, 0.5)
 RADIUS = 0.5
 
 
-def is_in_circle(pt: Tuple[float, float], c_pt: Tuple[float, float], r: float) -> bool:
+def is_in_circle(
+    pt: Tuple[np.ndarray, np.ndarray], c_pt: Tuple[float, float], r: float
+) -> np.ndarray:
     x, y = pt
     cx, cy = c_pt
-    (x - cx) ** 2 + (y - cy) ** 2
     return (x - cx) ** 2 + (y - cy) ** 2 < r**2
 
 
-run_sims_and_report(
-    fn=lambda: is_in_circle(pt=choose_point(), c_pt=CENTER, r=RADIUS),
-    num_samples=1000,
-    trials_per_sample=10000,
-    sample_res_map=lambda x: 4 * x,
-)
+def simulate(
+    num_samples: Optional[int] = None,
+    trials_per_sample: Optional[int] = None,
+    seed: Optional[int] = None,
+    workers: Optional[int] = 1,
+    backend: Optional[str] = "batch",
+    **sim_kwargs,
+) -> RunningStats:
+    """Estimate pi as 4 times the fraction of random points in the circle.
+
+    Backend `"batch"` draws pseudo-random points (1000 samples of 10000 trials by default), `"qmc"`
+    delegates to `simulate_qmc()` with `num_samples` replicates of `trials_per_sample` points.
+
+    @see `run_sims_and_report()`, `run_qmc_backend()`
+    """
+    if backend == "qmc":
+        return run_qmc_backend(
+            simulate_qmc=simulate_qmc,
+            num_samples=num_samples,
+            trials_per_sample=trials_per_sample,
+            seed=seed,
+            workers=workers,
+            **sim_kwargs,
+        )
+    return run_sims_and_report(
+        batch_fn=lambda rng, n: is_in_circle(
+            pt=choose_points(rng=rng, n=n), c_pt=CENTER, r=RADIUS
+        ),
+        num_samples=1000 if num_samples is None else num_samples,
+        trials_per_sample=10000 if trials_per_sample is None else trials_per_sample,
+        sample_res_map=lambda x: 4 * x,
+        seed=seed,
+        workers=workers,
+        **sim_kwargs,
+    )
+
+
+def simulate_qmc(
+    n: Optional[int] = 1 << 16,
+    replicates: Optional[int] = 16,
+    seed: Optional[int] = None,
+) -> RunningStats:
+    """Estimate pi with `replicates` scrambled Sobol replicates of `n` points.
+
+    @see `qmc_replicates()`
+    """
+    return qmc_replicates(
+        f=lambda u: is_in_circle(pt=(u[:, 0], u[:, 1]), c_pt=CENTER, r=RADIUS),
+        dims=2,
+        n=n,
+        replicates=replicates,
+        seed=seed,
+        res_map=lambda x: 4 * x,
+    )
+
+
+if __name__ == "__main__":
+    simulate()
+    # randomized quasi-Monte Carlo: 16 scrambled Sobol replicates of 2^16 points
+    print(f"qmc: {simulate_qmc()}")
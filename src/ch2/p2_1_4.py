@@ -9,20 +9,76 @@ of pi. How accurate is your estimate?
 
 import math
 
-from typing import Tuple
+from typing import Optional, Tuple
 
-from utils.sim import choose_point, run_sims_and_report
+import numpy as np
 
+from src.utils.qmc import qmc_replicates, run_qmc_backend
+from src.utils.sim import choose_points, run_sims_and_report
+from src.utils.stats import RunningStats
 
-def is_under_sin(pt: Tuple[float, float]) -> bool:
+
+def is_under_sin(pt: Tuple[np.ndarray, np.ndarray]) -> np.ndarray:
     x, y = pt
-    sin_val = math.sin(math.pi * x)
+    sin_val = np.sin(math.pi * x)
     return y < sin_val
 
 
-run_sims_and_report(
-    fn=lambda: is_under_sin(pt=choose_point()),
-    num_samples=1000,
-    trials_per_sample=10000,
-    sample_res_map=lambda x: 2 / x,
-)
+def simulate(
+    num_samples: Optional[int] = None,
+    trials_per_sample: Optional[int] = None,
+    seed: Optional[int] = None,
+    workers: Optional[int] = 1,
+    backend: Optional[str] = "batch",
+    **sim_kwargs,
+) -> RunningStats:
+    """Estimate pi as 2 over the fraction of random points under `sin(pi x)`.
+
+    Backend `"batch"` draws pseudo-random points (1000 samples of 10000 trials by default), `"qmc"`
+    delegates to `simulate_qmc()` with `num_samples` replicates of `trials_per_sample` points.
+
+    @see `run_sims_and_report()`, `run_qmc_backend()`
+    """
+    if backend == "qmc":
+        return run_qmc_backend(
+            simulate_qmc=simulate_qmc,
+            num_samples=num_samples,
+            trials_per_sample=trials_per_sample,
+            seed=seed,
+            workers=workers,
+            **sim_kwargs,
+        )
+    return run_sims_and_report(
+        batch_fn=lambda rng, n: is_under_sin(pt=choose_points(rng=rng, n=n)),
+        num_samples=1000 if num_samples is None else num_samples,
+        trials_per_sample=10000 if trials_per_sample is None else trials_per_sample,
+        sample_res_map=lambda x: 2 / x,
+        seed=seed,
+        workers=workers,
+        **sim_kwargs,
+    )
+
+
+def simulate_qmc(
+    n: Optional[int] = 1 << 12,
+    replicates: Optional[int] = 16,
+    seed: Optional[int] = None,
+) -> RunningStats:
+    """Estimate pi with `replicates` scrambled Sobol replicates of `n` points on the smooth integrand
+    `E[y < sin(pi x) | x] = sin(pi x)`: error falls close to 1/n rather than 1/sqrt(n).
+
+    @see `qmc_replicates()`
+    """
+    return qmc_replicates(
+        f=lambda u: np.sin(math.pi * u[:, 0]),
+        dims=1,
+        n=n,
+        replicates=replicates,
+        seed=seed,
+        res_map=lambda x: 2 / x,
+    )
+
+
+if __name__ == "__main__":
+    simulate()
+    print(f"qmc: {simulate_qmc()}")
@@ -12,24 +12,84 @@ increases?
 """
 
 import math
-import random
 
-from typing import Tuple
+from typing import Optional, Tuple
 
-from utils.sim import run_sims_and_report
+import numpy as np
 
+from src.utils.sim import run_sims_and_report, run_until_precision
+from src.utils.stats import RunningStats
+from src.utils.variance import (
+    antithetic_batch_fn,
+    compare_variance_reduction,
+    lhs_batch_fn,
+)
 
-def sample_buffon_point() -> Tuple[float, float]:
-    return random.random() / 2, random.random() * math.pi / 2
 
+def sample_buffon_points(
+    rng: np.random.Generator, n: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    return rng.random(n) / 2, rng.random(n) * math.pi / 2
 
-def does_intersect_line(d: float, theta: float) -> bool:
-    return d <= math.sin(theta) / 2
 
+def does_intersect_line(d: np.ndarray, theta: np.ndarray) -> np.ndarray:
+    return d <= np.sin(theta) / 2
 
-run_sims_and_report(
-    fn=lambda: does_intersect_line(*sample_buffon_point()),
-    num_samples=1000,
-    trials_per_sample=10000,
-    sample_res_map=lambda a: 2 / a,
-)
+
+def does_intersect_line_u(u: np.ndarray) -> np.ndarray:
+    """`does_intersect_line` driven by `(n, 2)` uniforms, for variance-reduction methods."""
+    return does_intersect_line(d=u[:, 0] / 2, theta=u[:, 1] * math.pi / 2)
+
+
+def run_trials(rng: np.random.Generator, n: int) -> np.ndarray:
+    return does_intersect_line(*sample_buffon_points(rng=rng, n=n))
+
+
+def simulate(
+    num_samples: Optional[int] = 1000,
+    trials_per_sample: Optional[int] = 10000,
+    seed: Optional[int] = None,
+    workers: Optional[int] = 1,
+    backend: Optional[str] = "batch",
+    **sim_kwargs,
+) -> RunningStats:
+    """Estimate pi as `2/a` over samples of Buffon needle drops.
+
+    Backend `"batch"` draws plain pseudo-random drops; `"antithetic"` and `"lhs"` use the
+    variance-reduced samplers from `utils.variance`.
+
+    @see `run_sims_and_report()`
+    """
+    batch_fns = {
+        "batch": run_trials,
+        "antithetic": antithetic_batch_fn(f=does_intersect_line_u, dims=2),
+        "lhs": lhs_batch_fn(f=does_intersect_line_u, dims=2),
+    }
+    return run_sims_and_report(
+        batch_fn=batch_fns[backend],
+        num_samples=num_samples,
+        trials_per_sample=trials_per_sample,
+        sample_res_map=lambda a: 2 / a,
+        seed=seed,
+        workers=workers,
+        **sim_kwargs,
+    )
+
+
+if __name__ == "__main__":
+    simulate()
+
+    result = run_until_precision(
+        batch_fn=run_trials,
+        target_half_width=1e-3,
+        res_map=lambda a: 2 / a,
+    )
+    print(f"pi={result.estimate}, 95% CI={result.interval}, trials={result.trials}")
+
+    compare_variance_reduction(
+        f=does_intersect_line_u,
+        dims=2,
+        n=10000,
+        replicates=200,
+        res_map=lambda a: 2 / a,
+    )
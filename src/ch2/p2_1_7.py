@@ -18,31 +18,57 @@ described in Exercise 6. (Take `L = 1`.)
 """
 
 import math
-import random
 
-from typing import Tuple
+from typing import Optional, Tuple
 
-from utils.sim import run_sims_and_report
+import numpy as np
+
+from src.utils.sim import run_sims_and_report
+from src.utils.stats import RunningStats
 
 
 L = 1
 
 
-def sample_laplace_point() -> Tuple[float, float, float]:
+def sample_laplace_points(
+    rng: np.random.Generator, n: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     return (
-        random.random() / 2,
-        random.random() / 2,
-        random.random() * math.pi / 2,
+        rng.random(n) / 2,
+        rng.random(n) / 2,
+        rng.random(n) * math.pi / 2,
     )
 
 
-def does_intersect_grid(d1: float, d2: float, theta: float) -> bool:
-    return d1 <= (L / 2) * math.sin(theta) or d2 <= (L / 2) * math.cos(theta)
+def does_intersect_grid(
+    d1: np.ndarray, d2: np.ndarray, theta: np.ndarray
+) -> np.ndarray:
+    return (d1 <= (L / 2) * np.sin(theta)) | (d2 <= (L / 2) * np.cos(theta))
+
+
+def simulate(
+    num_samples: Optional[int] = 1000,
+    trials_per_sample: Optional[int] = 10000,
+    seed: Optional[int] = None,
+    workers: Optional[int] = 1,
+    **sim_kwargs,
+) -> RunningStats:
+    """Estimate pi as `(4L - L^2) / a` over samples of Laplace grid needle drops.
+
+    @see `run_sims_and_report()`
+    """
+    return run_sims_and_report(
+        batch_fn=lambda rng, n: does_intersect_grid(
+            *sample_laplace_points(rng=rng, n=n)
+        ),
+        num_samples=num_samples,
+        trials_per_sample=trials_per_sample,
+        sample_res_map=lambda a: (4 * L - L**2) / a,
+        seed=seed,
+        workers=workers,
+        **sim_kwargs,
+    )
 
 
-run_sims_and_report(
-    fn=lambda: does_intersect_grid(*sample_laplace_point()),
-    num_samples=1000,
-    trials_per_sample=10000,
-    sample_res_map=lambda a: (4 * L - L**2) / a,
-)
+if __name__ == "__main__":
+    simulate()
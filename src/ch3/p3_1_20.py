@@ -7,24 +7,31 @@ two people sit next to each other at both lunch and dinner. Can you make an
 intelligent conjecture for the case of n participants when n is large?
 """
 
+import numpy as np
+
 from itertools import permutations
-from random import randint
-from typing import List, Dict, Set
+from math import comb
+from random import sample
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 
+from src.utils.cache import cached
 from src.utils.sim import run_sims_and_report
+from src.utils.stats import RunningStats
 
 
 N = 10
 
-all_seatings = list(permutations(range(1, N)))
-for place in range(len(all_seatings)):
-    all_seatings[place] = (0,) + all_seatings[place]
+
+def generate_seatings(n: Optional[int] = N) -> Iterator[Tuple[int, ...]]:
+    """All seatings of `n` people around the table, with person `0` fixed in place `0`, generated lazily."""
+    return ((0,) + seating for seating in permutations(range(1, n)))
 
 
 def get_neighbors(seating: List[int]) -> Dict[int, Set[int]]:
     """Generate dict of (person, neighbors) for each person in given seating arrangement."""
+    n = len(seating)
     return {
-        m: set((seating[(place - 1 + N) % N], seating[(place + 1) % N]))
+        m: set((seating[(place - 1 + n) % n], seating[(place + 1) % n]))
         for place, m in enumerate(seating)
     }
 
@@ -40,39 +47,149 @@ def has_no_shared_neighbors(neighbors: Dict[int, Set[int]], seating: List[int])
         bool: `True` iff no person has the same neighbors as in the first seating.
     """
 
+    n = len(seating)
     for place, m in enumerate(seating):
-        l, r = seating[(place - 1 + N) % N], seating[(place + 1) % N]
+        l, r = seating[(place - 1 + n) % n], seating[(place + 1) % n]
         if l in neighbors[m] or r in neighbors[m]:
             return False
     return True
 
 
-def run_once() -> bool:
-    ri, rj = randint(0, len(all_seatings) - 1), randint(0, len(all_seatings) - 1)
-    seating1, seating2 = all_seatings[ri], all_seatings[rj]
+def random_seating(n: Optional[int] = N) -> List[int]:
+    """Uniformly random seating of `n` people with person `0` in place `0`, without materializing all seatings."""
+    return [0] + sample(range(1, n), n - 1)
+
+
+def run_once(n: Optional[int] = N) -> bool:
+    seating1, seating2 = random_seating(n=n), random_seating(n=n)
     neighbors1 = get_neighbors(seating=seating1)
     return has_no_shared_neighbors(neighbors=neighbors1, seating=seating2)
 
 
+def shares_neighbors(seatings: np.ndarray) -> np.ndarray:
+    """Vectorized check of `(trials, n)` seatings against the identity seating: `True` iff some pair
+    sits next to each other in both, i.e. some adjacent pair differs by `+-1 (mod n)`.
+    """
+    n = seatings.shape[1]
+    diff = (seatings - np.roll(seatings, 1, axis=1)) % n
+    return ((diff == 1) | (diff == n - 1)).any(axis=1)
+
+
+def run_batch(
+    rng: np.random.Generator,
+    trials: int,
+    n: Optional[int] = N,
+    max_entries: Optional[int] = 1 << 20,
+) -> np.ndarray:
+    """Vectorized `run_once()`: `trials` random seatings by batched Fisher-Yates shuffles of an
+    integer array (the first seating is the identity by symmetry), at most `max_entries` seats at a time
+    so memory stays constant in `n`.
+
+    Returns:
+        np.ndarray: `(trials,)` bool array, `True` iff no two people sit next to each other at both meals.
+    """
+    rows = max(1, max_entries // n)
+    res = np.empty(trials, dtype=bool)
+    for start in range(0, trials, rows):
+        size = min(rows, trials - start)
+        seatings = rng.permuted(
+            np.broadcast_to(np.arange(n, dtype=np.int32), (size, n)), axis=1
+        )
+        res[start : start + size] = ~shares_neighbors(seatings=seatings)
+    return res
+
+
 """
 ======== simulations========
 """
 
-run_sims_and_report(fn=run_once, num_samples=100, trials_per_sample=1000)
+
+def simulate(
+    num_samples: Optional[int] = 100,
+    trials_per_sample: Optional[int] = 1000,
+    seed: Optional[int] = None,
+    workers: Optional[int] = 1,
+    n: Optional[int] = N,
+    backend: Optional[str] = "batch",
+    **sim_kwargs,
+) -> RunningStats:
+    """Estimate probability no two of `n` people sit next to each other at both meals.
+
+    Backend `"batch"` shuffles integer arrays of seatings (fine for `n` in the thousands), `"scalar"`
+    samples one pair of seatings at a time.
+
+    @see `run_sims_and_report()`
+    """
+    return run_sims_and_report(
+        fn=(lambda: run_once(n=n)) if backend == "scalar" else None,
+        batch_fn=(
+            (lambda rng, trials: run_batch(rng=rng, trials=trials, n=n))
+            if backend == "batch"
+            else None
+        ),
+        num_samples=num_samples,
+        trials_per_sample=trials_per_sample,
+        seed=seed,
+        workers=workers,
+        **sim_kwargs,
+    )
 
 
 """
 ======== compute exact probability ========
 """
 
-# symmetry -> use identity as first seating
-first_seating = list(range(N))
-first_neighbors = get_neighbors(seating=first_seating)
-
-good_seating_indic = [
-    1 if has_no_shared_neighbors(neighbors=first_neighbors, seating=seating) else 0
-    for seating in all_seatings
-]
-good_seatings, total = sum(good_seating_indic), len(good_seating_indic)
 
-print(f"good_seatings={good_seatings}, total={total}, p={good_seatings / total}")
+@cached("p3_1_20.count_good_seatings_brute")
+def count_good_seatings_brute(n: Optional[int] = N) -> Tuple[int, int]:
+    """Count second seatings sharing no neighbors with the first, and all second seatings, by
+    checking every seating as it is generated (memory constant in `n`, time `(n-1)!`).
+    """
+    # symmetry -> use identity as first seating
+    first_seating = list(range(n))
+    first_neighbors = get_neighbors(seating=first_seating)
+
+    good_seatings, total = 0, 0
+    for seating in generate_seatings(n=n):
+        good_seatings += has_no_shared_neighbors(
+            neighbors=first_neighbors, seating=seating
+        )
+        total += 1
+    return good_seatings, total
+
+
+def count_good_seatings(n: Optional[int] = N) -> Tuple[int, int]:
+    """Same as `count_good_seatings_brute()` by inclusion-exclusion over the first seating's `n` neighbor pairs.
+
+    With person `0` fixed, seatings are the `(n-1)!` directed Hamiltonian cycles of `K_n`. Those using all
+    of a set `S` of `k < n` first-seating pairs, which form `j` runs, glue each run into one block:
+    `(n-k-1)!` circular orders of the `n-k` blocks times `2^j` run directions. A set of `k` pairs of the
+    `n`-cycle forms `j` runs in `(n/j) C(k-1, j-1) C(n-k-1, j-1)` ways. All `n` pairs form the first seating,
+    in 2 directions. O(n^2) terms, so `n` in the hundreds takes well under a second.
+    """
+    if n < 3:
+        return 0, 1
+    good_seatings = 2 * (-1) ** n
+    factorial = [1]
+    for i in range(1, n):
+        factorial.append(factorial[-1] * i)
+    for k in range(n):
+        num_cycles = factorial[n - k - 1] if k == 0 else 0
+        for j in range(1, min(k, n - k) + 1):
+            num_pair_sets = n * comb(k - 1, j - 1) * comb(n - k - 1, j - 1) // j
+            num_cycles += num_pair_sets * factorial[n - k - 1] * 2**j
+        good_seatings += (-1) ** k * num_cycles
+    return good_seatings, factorial[n - 1]
+
+
+def exact(n: Optional[int] = N) -> float:
+    good_seatings, total = count_good_seatings(n=n)
+    print(f"good_seatings={good_seatings}, total={total}, p={good_seatings / total}")
+    return good_seatings / total
+
+
+if __name__ == "__main__":
+    simulate()
+    exact()
+    # large n: p -> e^-2 ~= 0.1353
+    exact(n=500)
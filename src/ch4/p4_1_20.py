@@ -4,8 +4,14 @@ Randomly choose a ball from the urn and double it.
 Find limit of proportion of balls in urn
 """
 
+import numpy as np
+
 from random import random
+from typing import Optional
+
+from src.utils.chains import ChainState, run_chains
 from src.utils.sim import run_sims_and_report
+from src.utils.stats import RunningStats
 
 
 def run_sim_max(num_draws=10000) -> float:
@@ -28,5 +34,51 @@ def run_sim_red(num_draws=10000) -> float:
         return r / (w + r)
 
 
-run_sims_and_report(fn=run_sim_max, num_samples=100, trials_per_sample=100)
-run_sims_and_report(fn=run_sim_red, num_samples=100, trials_per_sample=100)
+def urn_step(rng: np.random.Generator, state: ChainState) -> ChainState:
+    w, r = state["w"], state["r"]
+    draw_white = rng.random(len(w)) < w / (w + r)
+    return {"w": w + draw_white, "r": r + ~draw_white}
+
+
+def run_sims_max(rng: np.random.Generator, n: int, num_draws=10000) -> np.ndarray:
+    """Vectorized `run_sim_max()` over `n` independent urns."""
+    res = run_chains(
+        rng=rng,
+        init={"w": np.ones(n, dtype=np.int64), "r": np.ones(n, dtype=np.int64)},
+        step=urn_step,
+        max_steps=num_draws,
+    )
+    w, r = res.state["w"], res.state["r"]
+    return np.maximum(w, r) / (w + r)
+
+
+def simulate(
+    num_samples: Optional[int] = 100,
+    trials_per_sample: Optional[int] = 100,
+    seed: Optional[int] = None,
+    workers: Optional[int] = None,
+    backend: Optional[str] = "batch",
+    **sim_kwargs,
+) -> RunningStats:
+    """Estimate expected limiting proportion of the majority color.
+
+    Backend `"batch"` runs the urns as vectorized chains, `"scalar"` one draw at a time.
+
+    @see `run_sims_and_report()`
+    """
+    return run_sims_and_report(
+        fn=run_sim_max if backend == "scalar" else None,
+        batch_fn=run_sims_max if backend == "batch" else None,
+        num_samples=num_samples,
+        trials_per_sample=trials_per_sample,
+        seed=seed,
+        workers=workers,
+        **sim_kwargs,
+    )
+
+
+if __name__ == "__main__":
+    simulate()
+    run_sims_and_report(
+        fn=run_sim_red, num_samples=100, trials_per_sample=100, workers=None
+    )
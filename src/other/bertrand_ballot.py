@@ -1,4 +1,11 @@
-from src.utils.binom import binom
+from typing import Optional
+
+from src.utils.ballot import (
+    ballot_count,
+    ballot_count_dp,
+    ballot_counts_mod,
+    multi_ballot_count,
+)
 
 
 N, M = 20, 13
@@ -8,21 +15,24 @@ def bertrand_ballot_dp(n: int, m: int) -> int:
     if n < m:
         raise ValueError(f"n={n} votes for A cannot be less than m={m} votes for B")
 
-    # dp[a][b] = num paths starting from a votes for A, b votes for B
-    opt = [[0 for _ in range(m + 1)] for _ in range(n + 1)]
-    for a in range(n, -1, -1):
-        # must have a >= b
-        for b in range(min(a, m), -1, -1):
-            if a == n:
-                opt[a][b] = 1
-            else:
-                opt[a][b] += opt[a + 1][b]
-                if b + 1 <= m and b + 1 <= a:
-                    opt[a][b] += opt[a][b + 1]
-    return opt[0][0]
+    return ballot_count_dp(n=n, m=m)
+
+
+def bertrand_ballot_closed_form(n: int, m: int) -> int:
+    return ballot_count(n=n, m=m)
+
+
+def exact(n: Optional[int] = N, m: Optional[int] = M) -> int:
+    return bertrand_ballot_dp(n=n, m=m)
+
 
+if __name__ == "__main__":
+    print(bertrand_ballot_dp(n=N, m=M))
+    print(bertrand_ballot_closed_form(n=N, m=M))
 
-print(bertrand_ballot_dp(n=N, m=M))
-print((binom(n=N + M, k=M) * (N + 1 - M)) // (N + 1))
+    assert bertrand_ballot_dp(n=N, m=M) == bertrand_ballot_closed_form(n=N, m=M)
 
-assert bertrand_ballot_dp(n=N, m=M) == (binom(n=N + M, k=M) * (N + 1 - M)) // (N + 1)
+    # A always strictly more than twice B; three candidates; vote totals in the millions (mod 10^9 + 7)
+    print(ballot_count(n=N, m=M // 2, k=2, strict=True))
+    print(multi_ballot_count(votes=[N, M, M // 2]))
+    print(ballot_counts_mod(n=[10**6, 2 * 10**6], m=[10**6 - 1, 10**6]))
@@ -3,10 +3,22 @@ Each face of a cube is painted randomly one of the colors red, orange, yellow, g
 What is the probability that the cube has at least one pair of faces that share an edge and are the same color?
 """
 
-from typing import List
+from fractions import Fraction
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.utils.cache import cached
+from src.utils.coloring import (
+    Polyhedron,
+    count_distinct_colorings,
+    count_proper_colorings,
+    platonic_solids,
+    proper_coloring_probabilities,
+)
 
 
 COLORS = [i for i in range(1, 7)]
+# faces `f` and `5 - f` are opposite
+CUBE = platonic_solids()["cube"]
 
 
 def generate_paintings() -> List[List[int]]:
@@ -20,25 +32,62 @@ def generate_paintings() -> List[List[int]]:
             painting[idx] = color
             backtrack_paintings(painting=painting, idx=idx + 1)
 
-    backtrack_paintings(painting=[0 for _ in range(len(COLORS))], idx=0)
+    backtrack_paintings(painting=[0 for _ in range(CUBE.num_faces)], idx=0)
     return all_paintings
 
 
 def does_painting_share_color_edge(painting: List[int]) -> bool:
-    for face in range(6):
-        for other_face in range(6):
-            if face == other_face or face == 6 - other_face - 1:
-                continue
-            if painting[face] == painting[other_face]:
-                return True
-    return False
-
-
-all_paintings = generate_paintings()
-indic = [
-    1 if does_painting_share_color_edge(painting=painting) else 0
-    for painting in all_paintings
-]
-
-print(sum(indic))
-print(len(all_paintings))
+    return any(
+        painting[face] == painting[other_face]
+        for face, other_faces in enumerate(CUBE.adjacency)
+        for other_face in other_faces
+    )
+
+
+@cached("cube_painting.count_paintings_brute")
+def count_paintings_brute() -> Tuple[int, int]:
+    """Count paintings with some pair of edge-sharing faces the same color, and all paintings."""
+    all_paintings = generate_paintings()
+    indic = [
+        1 if does_painting_share_color_edge(painting=painting) else 0
+        for painting in all_paintings
+    ]
+    return sum(indic), len(all_paintings)
+
+
+def count_paintings(num_colors: Optional[int] = len(COLORS)) -> Tuple[int, int]:
+    """Same as `count_paintings_brute()` by counting the complement, the paintings with no edge-sharing
+    faces the same color, with pruned backtracking on the cube's face graph.
+    """
+    total = num_colors**CUBE.num_faces
+    return total - count_proper_colorings(CUBE.adjacency, k=num_colors), total
+
+
+def shared_edge_probabilities(
+    poly: Optional[Polyhedron] = CUBE, num_colors: Iterable[int] = range(2, 101)
+) -> Dict[int, Fraction]:
+    """Exact probability that some pair of edge-sharing faces of `poly` has the same color, for each
+    number of colors: `1 - P(k) / k^faces` with `P` the chromatic polynomial of the face graph.
+    """
+    return {
+        k: 1 - p
+        for k, p in proper_coloring_probabilities(poly.adjacency, ks=num_colors).items()
+    }
+
+
+def exact(num_colors: Optional[int] = len(COLORS)) -> float:
+    """Probability some pair of faces sharing an edge has the same color."""
+    shared, total = count_paintings(num_colors=num_colors)
+    distinct = count_distinct_colorings(CUBE, k=num_colors)
+
+    print(shared)
+    print(total)
+    print(f"paintings with no shared color edge, up to rotation: {distinct}")
+    return shared / total
+
+
+if __name__ == "__main__":
+    exact()
+    for name in ["cube", "dodecahedron", "icosahedron"]:
+        probs = shared_edge_probabilities(poly=platonic_solids()[name])
+        print(name, {k: float(probs[k]) for k in [2, 6, 10, 100]})
@@ -7,7 +7,9 @@ on the integers starting at positions 0 and 4, respectively. Compute the probabi
 Bort at all 10 steps.
 """
 
-from typing import List
+from fractions import Fraction
+from math import comb
+from typing import List, Optional
 
 T_START = 0
 B_START = 4
@@ -36,10 +38,80 @@ def does_bort_stay_ahead(t_moves: List[int], b_moves: List[int]) -> bool:
     return True
 
 
-move_sequences = generate_possible_moves(li=[], forward_ct=0)
-successes = 0
-for t_moves in move_sequences:
-    for b_moves in move_sequences:
-        successes += 1 if does_bort_stay_ahead(t_moves=t_moves, b_moves=b_moves) else 0
+def exact_brute() -> float:
+    """Probability both turtles return with Bort strictly ahead throughout, by enumerating move pairs."""
+    move_sequences = generate_possible_moves(li=[], forward_ct=0)
+    successes = 0
+    for t_moves in move_sequences:
+        for b_moves in move_sequences:
+            successes += (
+                1 if does_bort_stay_ahead(t_moves=t_moves, b_moves=b_moves) else 0
+            )
 
-print(f"successes={successes}, diff={len(move_sequences) ** 2 - successes}")
+    print(f"successes={successes}, diff={len(move_sequences) ** 2 - successes}")
+    return successes / 4**MOVES
+
+
+def count_dominated_pairs(
+    moves: Optional[int] = MOVES, gap: Optional[int] = B_START - T_START
+) -> int:
+    """Number of pairs of `moves`-step walks with both turtles back at their starts and Bort strictly
+    ahead throughout, when Bort starts `gap` ahead.
+
+    Pairs returning to the starts number `C(moves, moves/2)^2`. Those where Bort first falls behind hit
+    the line `b - t = -c` (`c = gap mod 2`, the gap changes by 0 or 2 per step); reflecting each pair's
+    walks after that hit in this line, i.e. swapping the turtles' moves, maps them one-to-one onto pairs
+    ending `2h` (`h = ceil(gap/2)`) behind/ahead of their starts: `C(moves, moves/2 + h)^2`.
+    O(1) big-integer binomials, so thousands of moves are instant.
+    """
+    if moves % 2:
+        return 0
+    if gap <= 0:
+        return int(moves == 0)
+    half, h = moves // 2, (gap + 1) // 2
+    return comb(moves, half) ** 2 - comb(moves, half + h) ** 2
+
+
+def dominated_probabilities(
+    max_moves: Optional[int] = MOVES, gap: Optional[int] = B_START - T_START
+) -> List[Fraction]:
+    """Exact probability after each number of moves `0, ..., max_moves` (@see `count_dominated_pairs()`).
+    Both binomials are carried from `moves` to `moves + 2`, so the curve costs a few big-integer
+    products per point.
+    """
+    if gap <= 0:
+        return [Fraction(1)] + [Fraction(0)] * max_moves
+    h = (gap + 1) // 2
+    probs = []
+    # C(moves, moves/2), C(moves, moves/2 + h)
+    returned, reflected = 1, 0
+    for moves in range(max_moves + 1):
+        if moves % 2:
+            probs.append(Fraction(0))
+            continue
+        probs.append(Fraction(returned**2 - reflected**2, 4**moves))
+        half = moves // 2
+        growth = (moves + 1) * (moves + 2)
+        returned = returned * growth // (half + 1) ** 2
+        if half + 1 == h:
+            reflected = 1
+        elif half >= h:
+            reflected = reflected * growth // ((half + h + 1) * (half - h + 1))
+    return probs
+
+
+def exact(
+    moves: Optional[int] = MOVES, gap: Optional[int] = B_START - T_START
+) -> float:
+    """Probability both turtles return with Bort strictly ahead throughout, by the reflection principle."""
+    successes = count_dominated_pairs(moves=moves, gap=gap)
+    total = comb(moves, moves // 2) ** 2
+    print(f"successes={successes}, diff={total - successes}")
+    return successes / 4**moves
+
+
+if __name__ == "__main__":
+    exact_brute()
+    exact()
+    probs = dominated_probabilities(max_moves=1000)
+    print({moves: float(probs[moves]) for moves in [10, 100, 1000]})
@@ -12,21 +12,19 @@ IF not given existence of breaking floor `x`.
 If given existence of breaking floor, would take 0 drops.
 """
 
+from typing import Any, Dict, List, Optional, Tuple
 
-def min_egg_drops(eggs: int, floors: int) -> int:
-    """Given `eggs` and `floors`, find min drops needed to determine cutoff `x \in [1, floors]`
-    s.t. it is safe to drop an egg from below floor `x`, but not from floors `x` and above.
-    Assume it is possible that egg may not break for any `x \in [1, floors]`.
+from src.utils.cache import cached
 
-    Args:
-        eggs (int): Number of remaining eggs.
-        floors (int): Number of floors to test.
 
-    Returns:
-        int: Minimum drops needed to find safe floor cutoff for dropping eggs.
+@cached("egg_drop.egg_drop_table")
+def egg_drop_table(
+    eggs: int, floors: int
+) -> List[List[Tuple[Optional[int], Optional[int]]]]:
+    """`opt[e][f]` = (best floor to drop from, min drops to find cutoff floor) with `e` eggs, `f` floors to search.
+    @see `min_egg_drops()`
     """
 
-    # opt[e][f] = (best floor to drop from, min drops to find cutoff floor) with e eggs, f floors to search
     opt = [[(None, None) for _ in range(floors + 1)] for _ in range(eggs + 1)]
 
     # base case: if 1 egg left, must linearly drop one floor at a time worst-case
@@ -52,18 +50,155 @@ def min_egg_drops(eggs: int, floors: int) -> int:
                 if worst_case_ct < best_ct:
                     best_f, best_ct = drop_f, worst_case_ct
             opt[e][f] = (best_f, best_ct)
+    return opt
 
-    for e in range(1, eggs + 1):
-        s_list = list(
-            map(
-                lambda x: f"{e} eggs, {x[0]} floors -> drop from {x[1][0]}, worst-case drops = {x[1][1]}",
-                enumerate(opt[e]),
+
+def min_egg_drops(eggs: int, floors: int, verbose: Optional[bool] = False) -> int:
+    """Given `eggs` and `floors`, find min drops needed to determine cutoff `x \in [1, floors]`
+    s.t. it is safe to drop an egg from below floor `x`, but not from floors `x` and above.
+    Assume it is possible that egg may not break for any `x \in [1, floors]`.
+
+    Args:
+        eggs (int): Number of remaining eggs.
+        floors (int): Number of floors to test.
+        verbose (Optional[bool], optional): Print every `(eggs, floors)` entry of the table. Defaults to `False`.
+
+    Returns:
+        int: Minimum drops needed to find safe floor cutoff for dropping eggs.
+    """
+
+    opt = egg_drop_table(eggs=eggs, floors=floors)
+    if verbose:
+        for e in range(1, eggs + 1):
+            s_list = list(
+                map(
+                    lambda x: f"{e} eggs, {x[0]} floors -> drop from {x[1][0]}, worst-case drops = {x[1][1]}",
+                    enumerate(opt[e]),
+                )
             )
-        )
-        print("\n".join(s_list))
+            print("\n".join(s_list))
     return opt[eggs][floors][1]
 
 
-eggs = 3
-floors = 131
-print(min_egg_drops(eggs=eggs, floors=floors - 1))
+"""
+======== drops -> floors inverse formulation ========
+"""
+
+
+def max_floors(drops: int, eggs: int, cap: Optional[int] = None) -> int:
+    """Most floors whose cutoff can be found with `drops` drops and `eggs` eggs: `sum_{i=1..eggs} C(drops, i)`.
+    (Drop from floor `max_floors(drops - 1, eggs - 1) + 1`: a break leaves that many floors below for
+    one egg less, and a safe drop leaves `max_floors(drops - 1, eggs)` above.)
+
+    Args:
+        drops (int): Number of drops.
+        eggs (int): Number of eggs.
+        cap (Optional[int], optional): Stop summing once the total reaches `cap`. Defaults to no cap.
+
+    Returns:
+        int: Max floors (at least `cap`, if capped and reached).
+    """
+    total, term = 0, 1
+    for i in range(1, min(eggs, drops) + 1):
+        term = term * (drops - i + 1) // i
+        total += term
+        if cap is not None and total >= cap:
+            break
+    return total
+
+
+def min_drops(eggs: int, floors: int) -> int:
+    """Same as `min_egg_drops()`, by binary search on `drops` for the least with `max_floors(drops, eggs) >= floors`.
+    O(eggs log floors), so floors up to `10^9` and more are instant.
+    """
+    if eggs < 1 and floors > 0:
+        raise ValueError(f"cannot search {floors} floors with eggs={eggs}")
+    lo, hi = 0, floors
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if max_floors(drops=mid, eggs=eggs, cap=floors) >= floors:
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+def optimal_first_drops(eggs: int, floors: int) -> range:
+    """All first-drop floors (in `[1, floors]`) achieving `min_drops(eggs, floors)`.
+    The first is the one `min_egg_drops()`'s table picks.
+    """
+    drops = min_drops(eggs=eggs, floors=floors)
+    # break: `x - 1` floors below with `eggs - 1` eggs; safe: `floors - x` floors above with `eggs` eggs
+    lo = max(1, floors - max_floors(drops=drops - 1, eggs=eggs, cap=floors))
+    hi = min(floors, max_floors(drops=drops - 1, eggs=eggs - 1, cap=floors) + 1)
+    return range(lo, hi + 1)
+
+
+class DropNode:
+    eggs: int
+    base: int
+    floors: int
+    drops: int
+    floor: Optional[int]
+
+    def __init__(self, eggs: int, floors: int, base: Optional[int] = 0):
+        """Node of the optimal strategy tree: the cutoff is searched among floors `base + 1, ..., base + floors`
+        with `eggs` eggs. Children are built on demand, so trees over `10^9` floors can be walked.
+
+        Args:
+            eggs (int): Number of remaining eggs.
+            floors (int): Number of floors left to test.
+            base (Optional[int], optional): Floors up to `base` are known safe. Defaults to 0.
+        """
+        self.eggs = eggs
+        self.base = base
+        self.floors = floors
+        self.drops = min_drops(eggs=eggs, floors=floors)
+        # drop as high as a break can still be resolved with one egg less
+        self.floor = (
+            base + optimal_first_drops(eggs=eggs, floors=floors)[-1]
+            if floors > 0
+            else None
+        )
+
+    def on_break(self) -> "DropNode":
+        return DropNode(
+            eggs=self.eggs - 1, floors=self.floor - self.base - 1, base=self.base
+        )
+
+    def on_safe(self) -> "DropNode":
+        return DropNode(
+            eggs=self.eggs, floors=self.base + self.floors - self.floor, base=self.floor
+        )
+
+    def to_dict(self) -> Optional[Dict[str, Any]]:
+        """Expand the full subtree: `{"floor": ..., "break": ..., "safe": ...}`, `None` for leaves."""
+        if self.floor is None:
+            return None
+        return {
+            "floor": self.floor,
+            "break": self.on_break().to_dict(),
+            "safe": self.on_safe().to_dict(),
+        }
+
+    def __str__(self) -> str:
+        return f"DropNode[eggs={self.eggs}, floors={self.base + 1}..{self.base + self.floors}, drop from {self.floor}, worst-case drops = {self.drops}]"
+
+    def __repr__(self) -> str:
+        return str(self)
+
+
+EGGS = 3
+FLOORS = 131
+
+
+def exact(eggs: Optional[int] = EGGS, floors: Optional[int] = FLOORS) -> int:
+    """Min worst-case drops to find the cutoff, given one exists in `[1, floors]`. @see module docstring"""
+    return min_drops(eggs=eggs, floors=floors - 1)
+
+
+if __name__ == "__main__":
+    print(exact())
+    first_drops = optimal_first_drops(eggs=EGGS, floors=FLOORS - 1)
+    print(f"optimal first drop from any floor in {first_drops[0]}..{first_drops[-1]}")
+    print(DropNode(eggs=EGGS, floors=FLOORS - 1))
@@ -3,6 +3,14 @@ Start at n, at each step, +1 w/ prob p, -1 w/ prob 1-p.
 Ruin once hit 0. Find prob ruin at exactly n+2k steps
 """
 
+import numpy as np
+
+from scipy.special import xlogy
+from typing import Optional, Union
+
+from src.utils.binom import log_binom
+
+
 N = 5
 K = 3
 P = 1 / 3
@@ -23,4 +31,50 @@ def gamblers_ruin_dp(n: int, k: int, p: float) -> float:
     return opt[n][0]
 
 
-print(gamblers_ruin_dp(n=N, k=K, p=P))
+def first_passage_probs(
+    n: Union[int, np.ndarray], p: Union[float, np.ndarray], horizon: int
+) -> np.ndarray:
+    """Distribution of the ruin time: probability of first hitting 0 at exactly step `t`, for every
+    `t = 0, ..., horizon`, vectorized over starting capitals and step probabilities.
+
+    By the hitting time theorem, a walk from `n > 0` first hits 0 at step `t` w.p. `(n / t) P(S_t = -n)`
+    = `(n / t) C(t, k) p^k (1-p)^(n+k)` with `k = (t - n) / 2` up-steps; evaluated in log space, so
+    `horizon = 10^6` takes well under a second in `O(horizon)` memory per start.
+
+    Args:
+        n (Union[int, np.ndarray]): Starting capital(s).
+        p (Union[float, np.ndarray]): Probability(ies) of a `+1` step, broadcast against `n`.
+        horizon (int): Last step `T`.
+
+    Returns:
+        np.ndarray: Shape `broadcast(n, p).shape + (horizon + 1,)`; `[..., t]` = P(ruin at exactly `t` steps).
+    """
+    n, p = np.broadcast_arrays(
+        np.asarray(n, dtype=np.int64), np.asarray(p, dtype=np.float64)
+    )
+    t = np.arange(horizon + 1)
+    n_col, p_col = n[..., None], p[..., None]
+    up_steps = t - n_col
+    valid = (up_steps >= 0) & (up_steps % 2 == 0) & (t > 0)
+    k = np.where(valid, up_steps // 2, 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_probs = (
+            np.log(n_col)
+            - np.log(t)
+            + log_binom(t, k)
+            + xlogy(k, p_col)
+            + xlogy(n_col + k, 1 - p_col)
+        )
+    probs = np.where(valid, np.exp(log_probs), 0.0)
+    # already ruined
+    probs[..., 0] = n == 0
+    return probs
+
+
+def exact(n: Optional[int] = N, k: Optional[int] = K, p: Optional[float] = P) -> float:
+    return float(first_passage_probs(n=n, p=p, horizon=n + 2 * k)[n + 2 * k])
+
+
+if __name__ == "__main__":
+    print(exact())
+    print(gamblers_ruin_dp(n=N, k=K, p=P))
@@ -10,12 +10,19 @@ smallest number of transactions needed to accomplish the challenge? If impossibl
 -1.
 """
 
+import os
+
+import numpy as np
+
+from collections import deque
 from enum import Enum
-from queue import Queue
-from typing import Callable, Dict, List, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
+from src.utils.pouring import DRAIN, PouringPuzzle, ReachabilityTable
 
-DISCARD_IDX = -1
+
+DISCARD_IDX = DRAIN
+BARREL_CAP, JUG1_CAP, JUG2_CAP = 120, 5, 7
 
 
 class MoveType(Enum):
@@ -51,6 +58,10 @@ class MoveType(Enum):
         }
 
 
+MOVE_FROM_TO = MoveType.get_from_to_dict()
+MOVE_TYPES = {from_to: move_type for move_type, from_to in MOVE_FROM_TO.items()}
+
+
 class Container:
     amt: int
     cap: int
@@ -136,8 +147,7 @@ class Node:
         """
         neighbors: List[Tuple["Node", MoveType]] = []
         container_list = list(self.get_container_tuple())
-        move_type_dict = MoveType.get_from_to_dict()
-        for move_type, (from_idx, to_idx) in move_type_dict.items():
+        for move_type, (from_idx, to_idx) in MOVE_FROM_TO.items():
             from_c = container_list[from_idx]
             if to_idx == DISCARD_IDX:
                 # dummy container to discard into
@@ -192,10 +202,10 @@ def reconstruct_path(
     path = []
     while end_node in pred and pred[end_node] is not None:
         prev_node, move_type, amt_poured = pred[end_node]
-        path = [(end_node, move_type, amt_poured)] + path
+        path.append((end_node, move_type, amt_poured))
         end_node = prev_node
-    path = [(end_node, None, 0)] + path
-    return path
+    path.append((end_node, None, 0))
+    return path[::-1]
 
 
 def search(
@@ -213,11 +223,10 @@ def search(
     Returns:
         List[Tuple[Node, MoveType, int]]: Shortest path to state satisfying `is_target`, or `[]` if none exists.
     """
-    q: "Queue[Node]" = Queue(-1)
-    q.put(initial_state)
+    q = deque([initial_state])
     pred: Dict[Node, Tuple[Node, MoveType, int]] = {initial_state: None}
-    while not q.empty():
-        node = q.get()
+    while q:
+        node = q.popleft()
         if is_target(node):
             print(f"found {node} (visited {len(pred)})")
             return reconstruct_path(pred=pred, end_node=node)
@@ -228,28 +237,71 @@ def search(
             if neighbor_node in pred:
                 continue
             pred[neighbor_node] = (node, move_type, amt_poured)
-            q.put(neighbor_node)
+            q.append(neighbor_node)
 
     print(f"not found (visited {len(pred)})")
     return []
 
 
-initial_state = Node(Container(120, 120), Container(0, 5), Container(0, 7))
-path = search(
-    initial_state=initial_state,
-    is_target=lambda node: node.jug1.amt == 1 and node.jug2.amt == 1,
-)
-
-path = list(
-    map(
-        lambda step: (
-            step[0],
-            step[1].name if step[1] is not None else "START",
-            step[2],
-        ),
-        path,
+def solve() -> List[Tuple[Node, MoveType, int]]:
+    """Shortest pouring sequence leaving exactly 1 quart in each jug.
+    Bidirectional search over integer-encoded states (@see `PouringPuzzle`); `search()` gives the same length.
+    """
+    puzzle = PouringPuzzle(capacities=(BARREL_CAP, JUG1_CAP, JUG2_CAP))
+    path = puzzle.bidirectional_search(
+        start=(BARREL_CAP, 0, 0),
+        goals=[(barrel, 1, 1) for barrel in range(BARREL_CAP - 1)],
+    )
+    return [
+        (
+            Node(
+                Container(barrel, BARREL_CAP),
+                Container(jug1, JUG1_CAP),
+                Container(jug2, JUG2_CAP),
+            ),
+            MOVE_TYPES[move] if move is not None else None,
+            amt_poured,
+        )
+        for (barrel, jug1, jug2), move, amt_poured in path
+    ]
+
+
+def reachability_table(table_dir: Optional[str] = None) -> ReachabilityTable:
+    """Distances and predecessors of every state reachable from the full barrel, from one full BFS.
+    If `table_dir` is given, the table is loaded (memory-mapped) from there, or built and saved there.
+    """
+    if table_dir is not None and os.path.exists(table_dir):
+        return ReachabilityTable.load(path=table_dir)
+    puzzle = PouringPuzzle(capacities=(BARREL_CAP, JUG1_CAP, JUG2_CAP))
+    table = puzzle.explore(start=(BARREL_CAP, 0, 0))
+    if table_dir is not None:
+        table.save(path=table_dir)
+    return table
+
+
+def min_pours_by_jug_amounts(table_dir: Optional[str] = None) -> np.ndarray:
+    """`res[a, b]` = fewest pours leaving `a` quarts in jug 1 and `b` in jug 2 (`-1` if impossible)."""
+    return reachability_table(table_dir=table_dir).min_distances(containers=[1, 2])
+
+
+def exact() -> int:
+    """Smallest number of transactions, or `-1` if impossible."""
+    path = solve()
+    return len(path) - 1 if path else -1
+
+
+if __name__ == "__main__":
+    path = list(
+        map(
+            lambda step: (
+                step[0],
+                step[1].name if step[1] is not None else "START",
+                step[2],
+            ),
+            solve(),
+        )
     )
-)
-for node, move_type, amt_poured in path:
-    print(f"{move_type}: pour {amt_poured} -> {node}")
-print(f"num steps: {len(path) - 1}")
+    for node, move_type, amt_poured in path:
+        print(f"{move_type}: pour {amt_poured} -> {node}")
+    print(f"num steps: {len(path) - 1}")
+    print(min_pours_by_jug_amounts())
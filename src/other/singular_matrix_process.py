@@ -5,9 +5,14 @@ Find expected steps until singular matrix.
 
 import random
 
-from typing import List
+import numpy as np
 
+from typing import List, Optional, Tuple
+
+from src.utils.absorbing import build_chain, solve_from
+from src.utils.chains import ChainState, run_chains
 from src.utils.sim import run_sims_and_report
+from src.utils.stats import RunningStats
 
 
 def det(mat: List[int]) -> int:
@@ -25,5 +30,60 @@ def run_matrix_process() -> int:
     return steps
 
 
-run_sims_and_report(fn=run_matrix_process, num_samples=1000, trials_per_sample=1000)
-print(12 / 7)
+def flip_step(rng: np.random.Generator, state: ChainState) -> ChainState:
+    mat = state["mat"]
+    mat[np.arange(len(mat)), rng.integers(0, 4, size=len(mat))] ^= 1
+    return state
+
+
+def run_matrix_processes(rng: np.random.Generator, n: int) -> np.ndarray:
+    """Vectorized `run_matrix_process()` over `n` independent matrices: steps until singular."""
+    res = run_chains(
+        rng=rng,
+        init={"mat": np.tile(np.array([1, 0, 1, 0], dtype=np.int8), (n, 1))},
+        step=flip_step,
+        is_done=lambda state: det(mat=state["mat"].T) == 0,
+    )
+    return res.steps
+
+
+def simulate(
+    num_samples: Optional[int] = 1000,
+    trials_per_sample: Optional[int] = 1000,
+    seed: Optional[int] = None,
+    workers: Optional[int] = 1,
+    backend: Optional[str] = "batch",
+    **sim_kwargs,
+) -> RunningStats:
+    """Estimate expected steps until singular matrix.
+
+    Backend `"batch"` runs the processes as vectorized chains, `"scalar"` one flip at a time.
+
+    @see `run_sims_and_report()`
+    """
+    return run_sims_and_report(
+        fn=run_matrix_process if backend == "scalar" else None,
+        batch_fn=run_matrix_processes if backend == "batch" else None,
+        num_samples=num_samples,
+        trials_per_sample=trials_per_sample,
+        seed=seed,
+        workers=workers,
+        **sim_kwargs,
+    )
+
+
+def flips(mat: Tuple[int, ...]) -> List[Tuple[Tuple[int, ...], float]]:
+    return [(mat[:idx] + (1 - mat[idx],) + mat[idx + 1 :], 1 / 4) for idx in range(4)]
+
+
+def exact(start: Optional[Tuple[int, ...]] = (1, 0, 1, 0)) -> float:
+    """Expected steps until singular matrix, from the absorbing chain on the 16 matrices (= 12/7)."""
+    chain = build_chain(
+        start=[start], transitions=flips, is_absorbing=lambda mat: det(mat=mat) == 0
+    )
+    return float(solve_from(chain=chain, starts=[start]).expected_steps[0])
+
+
+if __name__ == "__main__":
+    simulate()
+    print(exact())
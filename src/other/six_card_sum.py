@@ -4,6 +4,11 @@ At each turn, correct guess -> $1.
 Find expected winnings under optimal strategy.
 """
 
+from typing import Optional
+
+from src.utils.card_guessing import solve_guessing
+
+
 ACES = 3
 JACKS = 3
 
@@ -23,4 +28,14 @@ def solve_dp(aces: int, jacks: int) -> float:
     return dp[aces][jacks]
 
 
-print(solve_dp(aces=ACES, jacks=JACKS))
+def exact(aces: Optional[int] = ACES, jacks: Optional[int] = JACKS) -> float:
+    res = solve_guessing(counts=[aces, jacks])
+    print(f"P(correct guesses = j): {res.distribution.round(6).tolist()}")
+    return res.expected
+
+
+if __name__ == "__main__":
+    print(exact())
+    print(solve_dp(aces=ACES, jacks=JACKS))
+    # standard deck: 13 ranks of 4
+    print(solve_guessing(counts=[4] * 13).expected)
@@ -0,0 +1,153 @@
+"""
+Problem registry.
+
+Maps each problem name to its module and entry points without importing anything, so listing
+problems is instant and a problem's dependencies are only loaded when it is run. Problem
+modules expose `simulate(num_samples, trials_per_sample, seed, workers, [backend], **params)`
+returning `RunningStats` and/or `exact(**params)`; `simulate` forwards extra keyword arguments
+(e.g. `cache`, `cache_key`) to `run_sims_and_report()`.
+"""
+
+import importlib
+
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+
+class Problem(NamedTuple):
+    name: str
+    module: str
+    description: str
+    simulate: Optional[str] = "simulate"
+    exact: Optional[str] = "exact"
+    backends: Tuple[str, ...] = ("scalar",)
+
+
+PROBLEMS: List[Problem] = [
+    Problem(
+        "p1_1_4",
+        "src.ch1.p1_1_4",
+        "racquetball: P(first server wins game)",
+        backends=("batch", "scalar"),
+    ),
+    Problem(
+        "p2_1_3",
+        "src.ch2.p2_1_3",
+        "pi from area of circle in unit square",
+        exact=None,
+        backends=("batch", "qmc"),
+    ),
+    Problem(
+        "p2_1_4",
+        "src.ch2.p2_1_4",
+        "pi from area under sin(pi x)",
+        exact=None,
+        backends=("batch", "qmc"),
+    ),
+    Problem(
+        "p2_1_6",
+        "src.ch2.p2_1_6",
+        "pi from Buffon's needle",
+        exact=None,
+        backends=("batch", "antithetic", "lhs"),
+    ),
+    Problem(
+        "p2_1_7",
+        "src.ch2.p2_1_7",
+        "pi from Laplace's needle on a grid",
+        exact=None,
+        backends=("batch",),
+    ),
+    Problem(
+        "p3_1_20",
+        "src.ch3.p3_1_20",
+        "P(no shared neighbors at two circular seatings)",
+        backends=("batch", "scalar"),
+    ),
+    Problem(
+        "p4_1_20",
+        "src.ch4.p4_1_20",
+        "Polya urn: limiting proportion of majority color",
+        exact=None,
+        backends=("batch", "scalar"),
+    ),
+    Problem(
+        "bertrand_ballot",
+        "src.other.bertrand_ballot",
+        "ballot sequences where A never trails B",
+        simulate=None,
+    ),
+    Problem(
+        "cube_painting",
+        "src.other.cube_painting",
+        "P(some adjacent cube faces share a color)",
+        simulate=None,
+    ),
+    Problem(
+        "dominated_turtle",
+        "src.other.dominated_turtle",
+        "P(both walks return with Bort strictly ahead throughout)",
+        simulate=None,
+    ),
+    Problem(
+        "egg_drop",
+        "src.other.egg_drop",
+        "min worst-case egg drops to find cutoff floor",
+        simulate=None,
+    ),
+    Problem(
+        "gamblers_ruin",
+        "src.other.gamblers_ruin",
+        "P(ruin at exactly n + 2k steps)",
+        simulate=None,
+    ),
+    Problem(
+        "jug_problem",
+        "src.other.jug_problem",
+        "fewest pours to measure 1 quart into each jug",
+        simulate=None,
+    ),
+    Problem(
+        "singular_matrix_process",
+        "src.other.singular_matrix_process",
+        "expected entry flips until a 2x2 matrix is singular",
+        backends=("batch", "scalar"),
+    ),
+    Problem(
+        "six_card_sum",
+        "src.other.six_card_sum",
+        "expected correct guesses drawing aces and jacks",
+        simulate=None,
+    ),
+    Problem(
+        "thorough_frog",
+        "src.other.thorough_frog",
+        "P(circle walk visits every node before the opposite one)",
+        backends=("scalar", "batch"),
+    ),
+]
+
+PROBLEMS_BY_NAME = {problem.name: problem for problem in PROBLEMS}
+
+
+def get_problem(name: str) -> Problem:
+    if name not in PROBLEMS_BY_NAME:
+        raise KeyError(
+            f"unknown problem {name}, expected one of {list(PROBLEMS_BY_NAME)}"
+        )
+    return PROBLEMS_BY_NAME[name]
+
+
+def load_entry(problem: Problem, entry: str) -> Callable:
+    """Import `problem`'s module and return its `entry` (`"simulate"` or `"exact"`) function.
+
+    Args:
+        problem (Problem): Registered problem.
+        entry (str): Entry point kind.
+
+    Returns:
+        Callable: Entry point function.
+    """
+    attr = getattr(problem, entry)
+    if attr is None:
+        raise ValueError(f"problem {problem.name} has no {entry} entry point")
+    return getattr(importlib.import_module(problem.module), attr)
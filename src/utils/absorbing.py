@@ -0,0 +1,177 @@
+import numpy as np
+
+from collections import deque
+from scipy import sparse
+from scipy.sparse.linalg import splu
+from typing import (
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+
+# state -> iterable of (next state, transition probability)
+TransitionFn = Callable[[Hashable], Iterable[Tuple[Hashable, float]]]
+
+
+class AbsorbingChain(NamedTuple):
+    transient: List[Hashable]
+    absorbing: List[Hashable]
+    index: Dict[Hashable, int]
+    q: sparse.csr_matrix
+    r: sparse.csr_matrix
+
+
+class AbsorptionResult(NamedTuple):
+    probs: np.ndarray
+    expected_steps: np.ndarray
+    steps_variance: np.ndarray
+
+
+def build_chain(
+    start: Iterable[Hashable],
+    transitions: TransitionFn,
+    is_absorbing: Callable[[Hashable], bool],
+) -> AbsorbingChain:
+    """Enumerate the states reachable from `start` by BFS and assemble the chain in canonical form
+    `P = [[Q, R], [0, I]]`.
+
+    Args:
+        start (Iterable[Hashable]): Initial state(s).
+        transitions (Callable[[Hashable], Iterable[Tuple[Hashable, float]]]): Outgoing `(state, prob)` of a transient state.
+         Repeated targets are summed.
+        is_absorbing (Callable[[Hashable], bool]): `True` iff state is absorbing.
+
+    Returns:
+        AbsorbingChain: Transient and absorbing states (`index` maps both to their row/column),
+         and sparse `q` (transient -> transient) and `r` (transient -> absorbing) blocks.
+    """
+
+    transient, absorbing, index = [], [], {}
+
+    def visit(state: Hashable) -> bool:
+        if state in index:
+            return False
+        states = absorbing if is_absorbing(state) else transient
+        index[state] = len(states)
+        states.append(state)
+        return states is transient
+
+    queue = deque(state for state in start if visit(state))
+    q_entries, r_entries = ([], [], []), ([], [], [])
+    while queue:
+        state = queue.popleft()
+        for next_state, prob in transitions(state):
+            if visit(next_state):
+                queue.append(next_state)
+            rows, cols, probs = r_entries if is_absorbing(next_state) else q_entries
+            rows.append(index[state])
+            cols.append(index[next_state])
+            probs.append(prob)
+
+    def assemble(entries, num_cols: int) -> sparse.csr_matrix:
+        rows, cols, probs = entries
+        return sparse.csr_matrix(
+            (probs, (rows, cols)), shape=(len(transient), num_cols)
+        )
+
+    return AbsorbingChain(
+        transient=transient,
+        absorbing=absorbing,
+        index=index,
+        q=assemble(q_entries, len(transient)),
+        r=assemble(r_entries, len(absorbing)),
+    )
+
+
+def solve_absorbing(
+    q: sparse.spmatrix, r: sparse.spmatrix, starts: Optional[Sequence[int]] = None
+) -> AbsorptionResult:
+    """Absorption analysis of a chain with transient block `q` and absorbing block `r`, by one
+    sparse LU factorization of `I - Q` (the fundamental matrix `N = (I - Q)^-1` is never formed).
+
+    - absorption probabilities `B = N R`
+    - expected steps to absorption `t = N 1`
+    - variance of steps to absorption `(2N - I) t - t^2`
+
+    `R` is never made dense: the rows of `B` for given `starts` come from the transposed system
+    `(I - Q)^T y = e_start` and the sparse product `R^T y`, and without `starts` `B` is solved one
+    column of `R` at a time. With many absorbing states, pass `starts` to keep memory `O(states)`.
+
+    Args:
+        q (sparse.spmatrix): `(t, t)` transitions among transient states.
+        r (sparse.spmatrix): `(t, a)` transitions from transient to absorbing states.
+        starts (Optional[Sequence[int]], optional): Transient states to report. Defaults to all.
+
+    Returns:
+        AbsorptionResult: `probs[i, k]` = P(absorbed in `k` | start `i`), and per-start `expected_steps`, `steps_variance`,
+         with rows `i` indexing `starts` if given, else all transient states.
+    """
+
+    if starts is not None and not all(0 <= start < q.shape[0] for start in starts):
+        raise ValueError(
+            f"starts={list(starts)} must index the {q.shape[0]} transient states"
+        )
+    lu = splu(sparse.csc_matrix(sparse.identity(q.shape[0]) - q))
+    expected_steps = lu.solve(np.ones(q.shape[0]))
+    steps_variance = 2 * lu.solve(expected_steps) - expected_steps - expected_steps**2
+    if starts is None:
+        r = sparse.csc_matrix(r)
+        probs = np.empty(r.shape, dtype=np.float64)
+        for col in range(r.shape[1]):
+            probs[:, col] = lu.solve(r[:, col].toarray().ravel())
+    else:
+        starts = np.asarray(starts, dtype=np.int64)
+        unit = np.zeros((q.shape[0], len(starts)))
+        unit[starts, np.arange(len(starts))] = 1.0
+        # rows of N = columns of N^T
+        n_rows = lu.solve(unit, trans="T")
+        probs = np.asarray((sparse.csr_matrix(r).T @ n_rows).T)
+        expected_steps = expected_steps[starts]
+        steps_variance = steps_variance[starts]
+    return AbsorptionResult(
+        probs=probs, expected_steps=expected_steps, steps_variance=steps_variance
+    )
+
+
+def solve_from(chain: AbsorbingChain, starts: Sequence[Hashable]) -> AbsorptionResult:
+    """`solve_absorbing()` for the rows of start states of `chain`, given as states rather than
+    indices since `chain.index` numbers absorbing and transient states separately. An absorbing start
+    is absorbed at once: 0 steps, and probability 1 of ending in itself.
+
+    Args:
+        chain (AbsorbingChain): Chain from `build_chain()`.
+        starts (Sequence[Hashable]): States of the chain to report.
+
+    Returns:
+        AbsorptionResult: Rows indexing `starts`.
+    """
+    missing = [state for state in starts if state not in chain.index]
+    if missing:
+        raise ValueError(f"states {missing} are not in the chain")
+    absorbing = set(chain.absorbing)
+    transient_rows = [i for i, state in enumerate(starts) if state not in absorbing]
+
+    probs = np.zeros((len(starts), len(chain.absorbing)))
+    expected_steps, steps_variance = np.zeros(len(starts)), np.zeros(len(starts))
+    for i, state in enumerate(starts):
+        if state in absorbing:
+            probs[i, chain.index[state]] = 1.0
+    if transient_rows:
+        res = solve_absorbing(
+            q=chain.q,
+            r=chain.r,
+            starts=[chain.index[starts[i]] for i in transient_rows],
+        )
+        probs[transient_rows] = res.probs
+        expected_steps[transient_rows] = res.expected_steps
+        steps_variance[transient_rows] = res.steps_variance
+    return AbsorptionResult(
+        probs=probs, expected_steps=expected_steps, steps_variance=steps_variance
+    )
@@ -0,0 +1,121 @@
+import numpy as np
+
+from typing import Optional, Sequence, Union
+
+from .binom import binom, get_mod_binom, log_binom
+
+ArrayLike = Union[int, np.ndarray]
+
+
+def ballot_count_dp(
+    n: int, m: int, k: Optional[int] = 1, strict: Optional[bool] = False
+) -> int:
+    """Number of orderings of `n` votes for A and `m` for B in which, after every vote, A has at least
+    (`strict`: more than) `k` times B's count, by a lattice-path DP over one row of `m + 1` counts.
+
+    Args:
+        n (int): Votes for A.
+        m (int): Votes for B.
+        k (Optional[int], optional): Lead factor. Defaults to 1.
+        strict (Optional[bool], optional): Require `a > k b` instead of `a >= k b`. Defaults to `False`.
+
+    Returns:
+        int: Number of orderings.
+    """
+    # row[b] = orderings reaching a votes for A, b for B (row holds a - 1 until overwritten)
+    row = [1] + [0] * m
+    for a in range(n + 1):
+        for b in range(m + 1):
+            if a == 0 and b == 0:
+                continue
+            if (a <= k * b) if strict else (a < k * b):
+                row[b] = 0
+            elif b > 0:
+                row[b] += row[b - 1]
+    return row[m]
+
+
+def ballot_count(
+    n: int, m: int, k: Optional[int] = 1, strict: Optional[bool] = False
+) -> int:
+    """Same as `ballot_count_dp()` in closed form. Strictly: `(n - km) / (n + m) C(n + m, m)` (ballot
+    theorem), and weakly `a >= kb` iff an extra leading A vote keeps `a + 1 > kb`, so weak `(n, m)` is
+    strict `(n + 1, m)`.
+    """
+    if strict:
+        if m == 0:
+            return 1
+        return binom(n=n + m, k=m) * max(n - k * m, 0) // (n + m)
+    return ballot_count(n=n + 1, m=m, k=k, strict=True)
+
+
+def _as_strict(n: np.ndarray, m: np.ndarray, k: int, strict: bool):
+    """Votes for A of the equivalent strict count (@see `ballot_count()`), and where it is nonzero."""
+    n = n if strict else n + 1
+    return n, (n > k * m) | (m == 0)
+
+
+def ballot_counts_mod(
+    n: ArrayLike,
+    m: ArrayLike,
+    k: Optional[int] = 1,
+    strict: Optional[bool] = False,
+    p: Optional[int] = 10**9 + 7,
+) -> ArrayLike:
+    """`ballot_count()` modulo a prime `p`, elementwise over broadcast arrays of vote counts, from the
+    division-free strict form `C(n + m - 1, m) - k C(n + m - 1, m - 1)`. All calls share factorial
+    tables (@see `get_mod_binom()`), so batches of millions of queries with totals in the millions
+    cost a few vectorized passes.
+    """
+    n, m = np.broadcast_arrays(
+        np.asarray(n, dtype=np.int64), np.asarray(m, dtype=np.int64)
+    )
+    n, valid = _as_strict(n=n, m=m, k=k, strict=strict)
+    mod_binom = get_mod_binom(p=p)
+    res = (mod_binom(n + m - 1, m) - k % p * mod_binom(n + m - 1, m - 1)) % p
+    res = np.where(m == 0, 1, np.where(valid, res, 0))
+    return res if res.ndim else int(res)
+
+
+def log_ballot_counts(
+    n: ArrayLike, m: ArrayLike, k: Optional[int] = 1, strict: Optional[bool] = False
+) -> np.ndarray:
+    """Natural log of `ballot_count()`, elementwise over broadcast arrays (`-inf` for no orderings)."""
+    n, m = np.broadcast_arrays(
+        np.asarray(n, dtype=np.float64), np.asarray(m, dtype=np.float64)
+    )
+    n, valid = _as_strict(n=n, m=m, k=k, strict=strict)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        res = np.log(n - k * m) - np.log(n + m) + log_binom(n + m, m)
+    return np.where(m == 0, 0.0, np.where(valid, res, -np.inf))
+
+
+def multi_ballot_count(votes: Sequence[int]) -> int:
+    """Number of orderings of the votes for candidates `0, 1, ..., r-1` in which, after every vote,
+    each candidate has at least as many votes as the next: standard Young tableaux of shape `votes`.
+
+    By the hook-length formula in Frobenius form, `N! prod_{i<j} (l_i - l_j) / prod_i l_i!` with
+    `l_i = votes[i] + r - 1 - i`; the factorials are assembled as the multinomial `(sum l)! / prod l_i!`
+    (a product of `binom`s) divided by the `r(r-1)/2` factors from `N + 1` to `sum l`.
+
+    Args:
+        votes (Sequence[int]): Votes per candidate.
+
+    Returns:
+        int: Number of orderings (0 unless `votes` is non-increasing).
+    """
+    if any(a < b for a, b in zip(votes, votes[1:])) or any(v < 0 for v in votes):
+        return 0
+    r = len(votes)
+    lengths = [v + r - 1 - i for i, v in enumerate(votes)]
+    numer, partial = 1, 0
+    for length in lengths:
+        partial += length
+        numer *= binom(n=partial, k=length)
+    for i in range(r):
+        for j in range(i + 1, r):
+            numer *= lengths[i] - lengths[j]
+    denom = 1
+    for factor in range(sum(votes) + 1, partial + 1):
+        denom *= factor
+    return numer // denom
@@ -1,7 +1,191 @@
+import math
+
+import numpy as np
+
+from scipy.special import gammaln
+from typing import Dict, List, Optional, Union
+
+ArrayLike = Union[int, float, np.ndarray]
+
+# `math.comb` is at least this fast up to here; beyond, the factored product wins by orders of magnitude
+_SMALL_K = 1 << 10
+# the factored product sieves every prime up to `n`: only worth it (and affordable) for `k` a sizable
+# fraction of `n` below this; otherwise `math.comb`'s `O(k)` product is faster
+_SIEVE_CAP = 10**7
+
+# primes below `_sieve_limit`, grown on demand
+_primes = np.array([], dtype=np.int64)
+_sieve_limit = 0
+
+
+def primes_upto(n: int) -> np.ndarray:
+    """Primes `<= n`, from a sieve grown (by doubling) and kept between calls."""
+    global _primes, _sieve_limit
+    if n >= _sieve_limit:
+        _sieve_limit = max(2 * _sieve_limit, n + 1, 1 << 10)
+        sieve = np.ones(_sieve_limit, dtype=bool)
+        sieve[:2] = False
+        for i in range(2, math.isqrt(_sieve_limit - 1) + 1):
+            if sieve[i]:
+                sieve[i * i :: i] = False
+        _primes = np.flatnonzero(sieve)
+    return _primes[: np.searchsorted(_primes, n, side="right")]
+
+
+def _legendre(n: int, primes: np.ndarray) -> np.ndarray:
+    """Exponent of each prime in `n!`: `sum_j floor(n / p^j)`."""
+    exps = np.zeros_like(primes)
+    powers = primes.copy()
+    active = powers <= n
+    while active.any():
+        exps[active] += n // powers[active]
+        powers[active] *= primes[active]
+        active &= powers <= n
+    return exps
+
+
+def _product(factors: List[int]) -> int:
+    """Product by a balanced tree, so the big multiplications are between numbers of similar size."""
+    while len(factors) > 1:
+        factors = [
+            factors[i] * factors[i + 1] if i + 1 < len(factors) else factors[i]
+            for i in range(0, len(factors), 2)
+        ]
+    return factors[0] if factors else 1
+
+
 def binom(n: int, k: int) -> int:
-    """Compute binomial coefficient `n CHOOSE k`."""
+    """Compute binomial coefficient `n CHOOSE k` (`0` unless `0 <= k <= n`).
+
+    Large coefficients (`k >= n / 16`, `n <= 10^7`) are assembled from their prime factorization
+    (Legendre's formula) with a product tree and no big divisions: `C(2*10^6, 10^6)` in about a second.
+    Otherwise `math.comb`, whose cost grows with `k` only, so `C(10^9, 2000)` needs no sieve.
+    """
+    if k < 0 or k > n:
+        return 0
     k = min(k, n - k)
-    res = 1
-    for i in range(1, k + 1):
-        res = (res * (n - k + i)) // i
-    return res
+    if k <= _SMALL_K or n > _SIEVE_CAP or 16 * k < n:
+        return math.comb(n, k)
+    primes = primes_upto(n)
+    exps = _legendre(n, primes) - _legendre(k, primes) - _legendre(n - k, primes)
+    return _product(
+        [int(p) ** int(e) for p, e in zip(primes[exps > 0], exps[exps > 0])]
+    )
+
+
+def pascal_row(n: int) -> List[int]:
+    """Row `n` of Pascal's triangle, `[C(n, 0), ..., C(n, n)]`, in one pass of the ratio
+    `C(n, k + 1) / C(n, k) = (n - k) / (k + 1)`, mirrored at the middle.
+    """
+    half = [1]
+    for k in range(n // 2):
+        half.append(half[-1] * (n - k) // (k + 1))
+    return half + half[: (n + 1) // 2][::-1]
+
+
+def log_binom(n: ArrayLike, k: ArrayLike) -> ArrayLike:
+    """Natural log of `C(n, k)`, elementwise over broadcast arrays (`-inf` unless `0 <= k <= n`).
+    Accurate for `n` far beyond where the coefficient (or a probability it multiplies) fits a float.
+    """
+    n, k = np.asarray(n, dtype=np.float64), np.asarray(k, dtype=np.float64)
+    valid = (0 <= k) & (k <= n)
+    with np.errstate(invalid="ignore"):
+        res = np.where(
+            valid, gammaln(n + 1) - gammaln(k + 1) - gammaln(n - k + 1), -np.inf
+        )
+    return res if res.ndim else float(res)
+
+
+class ModBinom:
+    p: int
+    fact: np.ndarray
+    inv_fact: np.ndarray
+
+    def __init__(self, p: Optional[int] = 10**9 + 7, size: Optional[int] = 0):
+        """Binomial coefficients modulo a prime `p`, from factorial and inverse-factorial tables that are
+        grown (by doubling) as larger arguments are queried. Arguments `>= p` use Lucas' theorem, so the
+        tables only ever span the largest base-`p` digit queried (at most `p` entries).
+
+        Args:
+            p (Optional[int], optional): Prime modulus below `2^31`, so table products fit in int64. Defaults to `10^9 + 7`.
+            size (Optional[int], optional): Initial table size. Defaults to 0.
+        """
+        if not 2 <= p < 1 << 31:
+            raise ValueError(f"modulus p={p} must be a prime in [2, 2^31)")
+        self.p = p
+        self.fact = np.ones(1, dtype=np.int64)
+        self.inv_fact = np.ones(1, dtype=np.int64)
+        self._grow(size)
+
+    def _grow(self, size: int):
+        """Extend the tables to cover `0, ..., size - 1` (capped at `p`; larger arguments go through Lucas)."""
+        old = len(self.fact)
+        if size <= old:
+            return
+        new = min(max(size, 2 * old), self.p)
+        p = self.p
+        fact = self.fact.tolist() + [0] * (new - old)
+        for i in range(old, new):
+            fact[i] = fact[i - 1] * i % p
+        # 1 / (i - 1)! = i / i!, downwards from the new top; entries below `old` are unchanged
+        inv_fact = [0] * (new - old)
+        inv = pow(fact[-1], p - 2, p)
+        for i in range(new - 1, old - 1, -1):
+            inv_fact[i - old] = inv
+            inv = inv * i % p
+        self.fact = np.array(fact, dtype=np.int64)
+        self.inv_fact = np.concatenate(
+            [self.inv_fact, np.array(inv_fact, dtype=np.int64)]
+        )
+
+    def _small(self, n: np.ndarray, k: np.ndarray) -> np.ndarray:
+        """`C(n, k) mod p` for `0 <= n < p` from the tables."""
+        valid = (0 <= k) & (k <= n)
+        k, n_minus_k = np.where(valid, k, 0), np.where(valid, n - k, 0)
+        res = (
+            self.fact[n] * self.inv_fact[k] % self.p * self.inv_fact[n_minus_k] % self.p
+        )
+        return np.where(valid, res, 0)
+
+    def __call__(self, n: ArrayLike, k: ArrayLike) -> ArrayLike:
+        """`C(n, k) mod p`, elementwise over broadcast integer arrays (`0` unless `0 <= k <= n`).
+
+        Args:
+            n (ArrayLike): Nonnegative integer(s).
+            k (ArrayLike): Integer(s).
+
+        Returns:
+            ArrayLike: Residue(s) in `[0, p)`.
+        """
+        n, k = np.broadcast_arrays(
+            np.asarray(n, dtype=np.int64), np.asarray(k, dtype=np.int64)
+        )
+        res = np.where((0 <= k) & (k <= n), 1, 0).astype(np.int64)
+        if n.size == 0:
+            return res
+        # Lucas: C(n, k) = prod_i C(n_i, k_i) over base-p digits; tables only span the digits seen
+        n, k = n.copy(), np.maximum(k, 0)
+        while (n > 0).any():
+            n_digit = n % self.p
+            self._grow(int(n_digit.max()) + 1)
+            res = res * self._small(n_digit, k % self.p) % self.p
+            n //= self.p
+            k //= self.p
+        return res if res.ndim else int(res)
+
+    def factorial(self, n: int) -> int:
+        """`n! mod p`."""
+        if n >= self.p:
+            return 0
+        self._grow(n + 1)
+        return int(self.fact[n])
+
+
+_mod_binoms: Dict[int, ModBinom] = {}
+
+
+def get_mod_binom(p: Optional[int] = 10**9 + 7) -> ModBinom:
+    """Shared `ModBinom` for modulus `p`, so its tables are grown once per process."""
+    if p not in _mod_binoms:
+        _mod_binoms[p] = ModBinom(p=p)
+    return _mod_binoms[p]
@@ -0,0 +1,210 @@
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import sys
+import tempfile
+
+from collections import OrderedDict
+from types import ModuleType
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .stats import RunningStats
+
+
+CACHE_DIR = os.environ.get(
+    "PROB_STATS_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "prob-stats-scripts"),
+)
+
+_MISSING = object()
+
+
+# bump to invalidate every cached result, e.g. after a change outside this package (numpy, scipy)
+# that results depend on
+CACHE_VERSION = 1
+# modules under this top-level package are the code a cached result can depend on
+_PACKAGE = __name__.split(".")[0]
+
+
+def _package_dependencies(module: ModuleType) -> List[ModuleType]:
+    """`module` and the modules of this package it uses, transitively: those it imports, and those
+    defining the functions, classes and objects it imports from them.
+    """
+    found: Dict[str, ModuleType] = {}
+    stack = [module]
+    while stack:
+        mod = stack.pop()
+        if mod.__name__ in found:
+            continue
+        found[mod.__name__] = mod
+        for value in vars(mod).values():
+            name = (
+                value.__name__
+                if isinstance(value, ModuleType)
+                else getattr(value, "__module__", None)
+            )
+            if (
+                isinstance(name, str)
+                and name.split(".")[0] == _PACKAGE
+                and name in sys.modules
+            ):
+                stack.append(sys.modules[name])
+    return sorted(found.values(), key=lambda mod: mod.__name__)
+
+
+@functools.lru_cache(maxsize=None)
+def _module_version(name: str) -> str:
+    sources = [str(CACHE_VERSION)]
+    for mod in _package_dependencies(sys.modules[name]):
+        try:
+            sources.append(inspect.getsource(mod))
+        except (OSError, TypeError):
+            sources.append(mod.__name__)
+    return hashlib.sha256("\0".join(sources).encode()).hexdigest()[:16]
+
+
+def code_version(obj: Any) -> str:
+    """Short hash of the source of the module defining `obj` and of every module of this package it
+    depends on (@see `_package_dependencies()`), plus `CACHE_VERSION`: changes whenever any of them is
+    edited. Code outside this package is not hashed; bump `CACHE_VERSION` when a change there matters.
+    """
+    module = inspect.getmodule(obj)
+    if module is None or module.__name__ not in sys.modules:
+        source = getattr(obj, "__qualname__", repr(obj))
+        return hashlib.sha256(source.encode()).hexdigest()[:16]
+    return _module_version(module.__name__)
+
+
+def dump_atomic(value: Any, path: str):
+    """Pickle `value` to `path` via a temporary file, so readers never see a partial write."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def make_key(problem: str, params: Dict[str, Any], version: Optional[str] = "") -> str:
+    """Cache key for `problem` evaluated at `params` by code at `version`.
+
+    Args:
+        problem (str): Problem (or computation) name.
+        params (Dict[str, Any]): Parameters; values must have a stable `repr`.
+        version (Optional[str], optional): Code version, e.g. from `code_version()`. Defaults to `""`.
+
+    Returns:
+        str: Hex digest key.
+    """
+    payload = repr((problem, sorted(params.items()), version))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResultCache:
+    cache_dir: Optional[str]
+    max_memory_entries: int
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = CACHE_DIR,
+        max_memory_entries: Optional[int] = 128,
+    ):
+        """Two-level result cache: in-memory LRU in front of a persistent directory of pickles.
+
+        Args:
+            cache_dir (Optional[str], optional): Directory for persistent entries, or `None`/`""` for memory only.
+             Defaults to `$PROB_STATS_CACHE_DIR` or `~/.cache/prob-stats-scripts`.
+            max_memory_entries (Optional[int], optional): Max entries kept in memory. Defaults to 128.
+        """
+        self.cache_dir = cache_dir or None
+        self.max_memory_entries = max_memory_entries
+        self._memory: "OrderedDict[str, Any]" = OrderedDict()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.pkl")
+
+    def _remember(self, key: str, value: Any):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return self._memory[key]
+        if self.cache_dir is not None:
+            try:
+                with open(self._path(key), "rb") as f:
+                    value = pickle.load(f)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                return default
+            self._remember(key, value)
+            return value
+        return default
+
+    def set(self, key: str, value: Any):
+        """Store `value` in memory and, atomically, on disk."""
+        self._remember(key, value)
+        if self.cache_dir is None:
+            return
+        dump_atomic(value=value, path=self._path(key))
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def cached_call(self, problem: str, fn: Callable, /, **params) -> Any:
+        """Return `fn(**params)`, computing it only if no result for `(problem, params, code version of fn)` is cached."""
+        key = make_key(problem=problem, params=params, version=code_version(fn))
+        res = self.get(key, _MISSING)
+        if res is _MISSING:
+            res = fn(**params)
+            self.set(key, res)
+        return res
+
+    def save_accumulator(self, key: str, stats: RunningStats, samples_done: int):
+        """Store partial Monte Carlo statistics after samples `0, ..., samples_done - 1` of a seeded run."""
+        self.set(key, (stats, samples_done))
+
+    def load_accumulator(self, key: str) -> Optional[Tuple[RunningStats, int]]:
+        """Partial `(stats, samples_done)` saved under `key`, or `None`."""
+        return self.get(key)
+
+
+_default_cache: Optional[ResultCache] = None
+
+
+def get_default_cache() -> ResultCache:
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResultCache()
+    return _default_cache
+
+
+def cached(problem: str, cache: Optional[ResultCache] = None) -> Callable:
+    """Decorator caching a deterministic solver's results by `(problem, bound arguments, code version)`.
+
+    Args:
+        problem (str): Problem name for the cache key.
+        cache (Optional[ResultCache], optional): Cache to use. Defaults to `get_default_cache()`.
+
+    Returns:
+        Callable: Decorator.
+    """
+
+    def decorator(fn: Callable) -> Callable:
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return (cache or get_default_cache()).cached_call(
+                problem, fn, **bound.arguments
+            )
+
+        wrapper.uncached = fn
+        return wrapper
+
+    return decorator
@@ -0,0 +1,99 @@
+import numpy as np
+
+from typing import Dict, Iterator, List, NamedTuple, Sequence, Set, Tuple
+
+
+# remaining cards per rank, sorted in decreasing order, zeros dropped: ranks are interchangeable
+State = Tuple[int, ...]
+
+
+class GuessingResult(NamedTuple):
+    expected: float
+    distribution: np.ndarray
+    values: Dict[State, float]
+    policy: Dict[State, int]
+
+
+def canonical(counts: Sequence[int]) -> State:
+    return tuple(sorted((c for c in counts if c > 0), reverse=True))
+
+
+def _draws(state: State) -> Iterator[Tuple[State, int, int]]:
+    """`(next state, ranks, count)` per distinct count in `state`: drawing a card of any of the `ranks`
+    ranks with `count` cards left (w.p. `ranks * count / total`) leads to the same next state.
+    """
+    start = 0
+    while start < len(state):
+        count = state[start]
+        end = start
+        while end < len(state) and state[end] == count:
+            end += 1
+        # decrementing the last of the tied ranks keeps the tuple sorted
+        decremented = (count - 1,) if count > 1 else ()
+        yield state[: end - 1] + decremented + state[end:], end - start, count
+        start = end
+
+
+def optimal_guess(counts: Sequence[int], policy: Dict[State, int]) -> int:
+    """Rank to guess with `counts` cards left per rank, under `policy` from `solve_guessing()`."""
+    return list(counts).index(policy[canonical(counts)])
+
+
+def solve_guessing(counts: Sequence[int]) -> GuessingResult:
+    """Optimal guessing when cards are drawn one at a time without replacement, each revealed after a
+    guess of its rank, and each correct guess pays $1.
+
+    States are the multisets of remaining counts per rank (@see `canonical()`), so symmetric states are
+    solved once, and they are evaluated level by level in the number of cards left. The guess does not
+    change which cards remain, so the best guess is a rank with the most cards left; ties between such
+    ranks are symmetric, so the payoff distribution does not depend on which is guessed. A 52-card deck
+    of 13 ranks has 2380 states.
+
+    Args:
+        counts (Sequence[int]): Cards of each rank.
+
+    Returns:
+        GuessingResult: `expected` correct guesses and their `distribution` (`[j]` = P(`j` correct)), with
+         expected correct guesses (`values`) and the count of the rank(s) to guess (`policy`) for every
+         reachable state.
+    """
+    root = canonical(counts)
+    total = sum(root)
+    levels: List[Set[State]] = [set() for _ in range(total + 1)]
+    levels[total].add(root)
+    for cards_left in range(total, 0, -1):
+        for state in levels[cards_left]:
+            levels[cards_left - 1].update(child for child, _, _ in _draws(state))
+
+    values: Dict[State, float] = {(): 0.0}
+    policy: Dict[State, int] = {}
+    # payoff distributions of the previous level only
+    dists: Dict[State, np.ndarray] = {(): np.ones(1)}
+    for cards_left in range(1, total + 1):
+        next_dists = {}
+        for state in levels[cards_left]:
+            guess = state[0]
+            value = guess / cards_left
+            dist = np.zeros(cards_left + 1)
+            for child, ranks, count in _draws(state):
+                prob = ranks * count / cards_left
+                value += prob * values[child]
+                child_dist = dists[child]
+                if count == guess:
+                    # one of the tied ranks is the guessed one
+                    hit = count / cards_left
+                    dist[1 : 1 + len(child_dist)] += hit * child_dist
+                    dist[: len(child_dist)] += (prob - hit) * child_dist
+                else:
+                    dist[: len(child_dist)] += prob * child_dist
+            values[state] = value
+            policy[state] = guess
+            next_dists[state] = dist
+        dists = next_dists
+
+    return GuessingResult(
+        expected=values[root],
+        distribution=dists.get(root, np.ones(1)),
+        values=values,
+        policy=policy,
+    )
@@ -0,0 +1,87 @@
+import numpy as np
+
+from typing import Callable, Dict, NamedTuple, Optional
+
+
+# state of a batch of chains: named arrays whose first axis indexes the chains
+ChainState = Dict[str, np.ndarray]
+# advance every chain in the state by one step, returning the new state
+StepFn = Callable[[np.random.Generator, ChainState], ChainState]
+# per-chain bool array: `True` iff the chain is absorbed/should stop
+DoneFn = Callable[[ChainState], np.ndarray]
+
+
+class ChainResult(NamedTuple):
+    state: ChainState
+    steps: np.ndarray
+    absorbed: np.ndarray
+
+
+def run_chains(
+    rng: np.random.Generator,
+    init: ChainState,
+    step: StepFn,
+    is_done: Optional[DoneFn] = None,
+    max_steps: Optional[int] = None,
+) -> ChainResult:
+    """Run a batch of independent Markov chains in lockstep as array state until each is absorbed.
+
+    Chains are checked before every step, starting with their initial state (absorbed there: 0 steps).
+    Finished chains have their terminal state and hitting time recorded and are dropped from the
+    working arrays at once, so no step is spent on them and long-running stragglers cost time
+    proportional to their own number.
+
+    Args:
+        rng (np.random.Generator): Source of randomness passed to `step`.
+        init (Dict[str, np.ndarray]): Initial state; all arrays share the first axis (one entry per chain).
+        step (Callable[[np.random.Generator, ChainState], ChainState]): Transition applied to all running chains.
+         May update the arrays in place.
+        is_done (Optional[Callable[[ChainState], np.ndarray]], optional): Absorption/stopping condition,
+         checked on the initial state and after each step. Defaults to never (run `max_steps` steps).
+        max_steps (Optional[int], optional): Steps after which remaining chains are stopped unabsorbed. Defaults to no limit.
+
+    Returns:
+        ChainResult: Terminal `state`, per-chain `steps` taken (hitting time if `absorbed`), and `absorbed` mask.
+    """
+
+    if is_done is None and max_steps is None:
+        raise ValueError("one of is_done, max_steps must be given")
+
+    n = len(next(iter(init.values())))
+    final = {key: np.array(arr, copy=True) for key, arr in init.items()}
+    steps = np.zeros(n, dtype=np.int64)
+    absorbed = np.zeros(n, dtype=bool)
+
+    state = {key: np.array(arr, copy=True) for key, arr in init.items()}
+    # original index of each running chain
+    idx = np.arange(n)
+    t = 0
+    while True:
+        if is_done is not None:
+            done = is_done(state)
+            if done.any():
+                finished = idx[done]
+                for key, arr in state.items():
+                    final[key][finished] = arr[done]
+                steps[finished] = t
+                absorbed[finished] = True
+                running = ~done
+                state = {key: arr[running] for key, arr in state.items()}
+                idx = idx[running]
+        if len(idx) == 0 or (max_steps is not None and t >= max_steps):
+            break
+        state = step(rng, state)
+        t += 1
+
+    # chains stopped by `max_steps`
+    for key, arr in state.items():
+        final[key][idx] = arr
+    steps[idx] = t
+    return ChainResult(state=final, steps=steps, absorbed=absorbed)
+
+
+def random_walk_steps(
+    rng: np.random.Generator, n: int, p: Optional[float] = 0.5
+) -> np.ndarray:
+    """`n` i.i.d. steps of `+1` w.p. `p` and `-1` otherwise."""
+    return np.where(rng.random(n) < p, 1, -1)
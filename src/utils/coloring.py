@@ -0,0 +1,309 @@
+import itertools
+import math
+
+from fractions import Fraction
+
+import numpy as np
+
+from typing import (
+    Collection,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Sequence,
+    Tuple,
+)
+
+
+# adjacency[face] = faces sharing an edge with `face`
+Adjacency = Sequence[Collection[int]]
+
+GOLDEN_RATIO = (1 + math.sqrt(5)) / 2
+
+
+class Polyhedron(NamedTuple):
+    name: str
+    centers: np.ndarray
+    adjacency: Tuple[Tuple[int, ...], ...]
+
+    @property
+    def num_faces(self) -> int:
+        return len(self.adjacency)
+
+
+def _signed_perms(
+    coords: Sequence[float], cyclic: bool = True
+) -> List[Tuple[float, ...]]:
+    """All sign choices of `coords`, under cyclic (or all) permutations of the axes."""
+    orders = (
+        [coords[i:] + coords[:i] for i in range(3)]
+        if cyclic
+        else list(itertools.permutations(coords))
+    )
+    points = set()
+    for order in orders:
+        for signs in itertools.product([1, -1], repeat=3):
+            points.add(tuple(s * c for s, c in zip(signs, order)))
+    return sorted(points, reverse=True)
+
+
+def polyhedron_from_centers(
+    name: str, centers: Sequence[Sequence[float]]
+) -> Polyhedron:
+    """Polyhedron whose faces have the given center directions; for regular polyhedra, faces
+    sharing an edge are exactly the pairs of nearest centers.
+    """
+    centers = np.asarray(centers, dtype=np.float64)
+    centers /= np.linalg.norm(centers, axis=1, keepdims=True)
+    dist = np.linalg.norm(centers[:, None] - centers[None, :], axis=-1)
+    np.fill_diagonal(dist, np.inf)
+    is_adjacent = np.isclose(dist, dist.min())
+    return Polyhedron(
+        name=name,
+        centers=centers,
+        adjacency=tuple(tuple(np.flatnonzero(row).tolist()) for row in is_adjacent),
+    )
+
+
+def platonic_solids() -> Dict[str, Polyhedron]:
+    """Regular polyhedra by name. Face centers are the vertices of the dual polyhedron; the cube's
+    faces are ordered `+x, +y, +z, -z, -y, -x`, so face `f` is opposite face `5 - f`.
+    """
+    phi = GOLDEN_RATIO
+    return {
+        poly.name: poly
+        for poly in [
+            polyhedron_from_centers(
+                "tetrahedron", [(1, 1, 1), (1, -1, -1), (-1, 1, -1), (-1, -1, 1)]
+            ),
+            polyhedron_from_centers(
+                "cube",
+                [(1, 0, 0), (0, 1, 0), (0, 0, 1), (0, 0, -1), (0, -1, 0), (-1, 0, 0)],
+            ),
+            polyhedron_from_centers(
+                "octahedron", list(itertools.product([1, -1], repeat=3))
+            ),
+            polyhedron_from_centers("dodecahedron", _signed_perms([0, 1, phi])),
+            polyhedron_from_centers(
+                "icosahedron",
+                list(itertools.product([1, -1], repeat=3))
+                + _signed_perms([0, 1 / phi, phi]),
+            ),
+        ]
+    }
+
+
+def rotation_group(poly: Polyhedron) -> List[Tuple[int, ...]]:
+    """Rotations of `poly` as face permutations (`perm[f]` = image of face `f`), derived from the
+    face-center geometry: every rotation is determined by the images of two non-parallel centers.
+    """
+    centers = poly.centers
+    a = centers[0]
+    b = next(c for c in centers if abs(a @ c) < 1 - 1e-9)
+
+    def frame(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        u = y - (x @ y) * x
+        u /= np.linalg.norm(u)
+        return np.stack([x, u, np.cross(x, u)], axis=1)
+
+    base = frame(a, b)
+    perms = set()
+    for a_img, b_img in itertools.permutations(centers, 2):
+        if not np.isclose(a_img @ b_img, a @ b):
+            continue
+        rotated = centers @ (frame(a_img, b_img) @ base.T).T
+        match = np.isclose(rotated[:, None], centers[None, :], atol=1e-9).all(axis=-1)
+        if (match.sum(axis=1) == 1).all():
+            perms.add(tuple(match.argmax(axis=1).tolist()))
+    return sorted(perms)
+
+
+def _search_order(adjacency: Adjacency) -> List[int]:
+    """Face order placing next the face with the most already-placed neighbors, so conflicts prune early."""
+    order, placed = [], set()
+    while len(order) < len(adjacency):
+        face = max(
+            (f for f in range(len(adjacency)) if f not in placed),
+            key=lambda f: (len(placed.intersection(adjacency[f])), len(adjacency[f])),
+        )
+        order.append(face)
+        placed.add(face)
+    return order
+
+
+def proper_colorings(adjacency: Adjacency, k: int) -> Iterator[Tuple[int, ...]]:
+    """Generate every coloring with colors `0, ..., k-1` in which no two adjacent faces share a color,
+    rejecting a color as soon as it clashes with an already-colored neighbor.
+    """
+    order = _search_order(adjacency=adjacency)
+    coloring = [-1] * len(adjacency)
+
+    def backtrack(idx: int) -> Iterator[Tuple[int, ...]]:
+        if idx == len(order):
+            yield tuple(coloring)
+            return
+        face = order[idx]
+        used = {coloring[nbr] for nbr in adjacency[face]}
+        for color in range(k):
+            if color not in used:
+                coloring[face] = color
+                yield from backtrack(idx + 1)
+        coloring[face] = -1
+
+    return backtrack(0)
+
+
+def count_proper_colorings(adjacency: Adjacency, k: int) -> int:
+    """Number of proper `k`-colorings (@see `proper_colorings()`), without visiting each one: colors
+    are interchangeable, so only colorings whose colors first appear in order `0, 1, ...` are generated,
+    and a face taking a brand new color stands for all `k - (colors used)` choices of it.
+    """
+    order = _search_order(adjacency=adjacency)
+    coloring = [-1] * len(adjacency)
+
+    def backtrack(idx: int, num_used: int) -> int:
+        if idx == len(order):
+            return 1
+        face = order[idx]
+        used = {coloring[nbr] for nbr in adjacency[face]}
+        total = 0
+        for color in range(num_used):
+            if color not in used:
+                coloring[face] = color
+                total += backtrack(idx + 1, num_used)
+        if num_used < k:
+            coloring[face] = num_used
+            total += (k - num_used) * backtrack(idx + 1, num_used + 1)
+        coloring[face] = -1
+        return total
+
+    return backtrack(0, 0)
+
+
+def _poly_add(acc: Dict, key: Tuple, poly: List[int]):
+    if key not in acc:
+        acc[key] = list(poly)
+        return
+    total = acc[key]
+    total.extend([0] * (len(poly) - len(total)))
+    for i, c in enumerate(poly):
+        total[i] += c
+
+
+def chromatic_polynomial(adjacency: Adjacency) -> List[int]:
+    """Chromatic polynomial of a face graph, the number of proper colorings `P(k) = sum_i coeffs[i] k^i`.
+
+    Faces are colored one at a time (@see `_search_order()`), tracking only how the colored faces that
+    still have uncolored neighbors are split into color classes; each split carries the polynomial
+    counting the colorings leading to it. A new face either joins a class none of its neighbors is in,
+    or takes one of the `k - (classes)` other colors. A face leaves the state once its neighbors are all
+    colored, so the work grows with the graph's pathwidth, not its size: milliseconds for the 20-face
+    icosahedron, whose colorings are far too many to enumerate.
+
+    Args:
+        adjacency (Sequence[Collection[int]]): Neighbors of each face.
+
+    Returns:
+        List[int]: Integer coefficients, lowest degree first.
+    """
+    if any(face in nbrs for face, nbrs in enumerate(adjacency)):
+        return [0]
+    order = _search_order(adjacency=adjacency)
+    position = {face: i for i, face in enumerate(order)}
+    last_nbr_position = {
+        face: max((position[nbr] for nbr in nbrs), default=-1)
+        for face, nbrs in enumerate(adjacency)
+    }
+
+    # color classes of the frontier faces -> coefficients of the number of colorings
+    states: Dict[Tuple[Tuple[int, ...], ...], List[int]] = {(): [1]}
+    for i, face in enumerate(order):
+        nbrs = set(adjacency[face])
+        next_states: Dict[Tuple[Tuple[int, ...], ...], List[int]] = {}
+        for classes, poly in states.items():
+            for j, cls in enumerate(classes):
+                if nbrs.isdisjoint(cls):
+                    joined = classes[:j] + (cls + (face,),) + classes[j + 1 :]
+                    _poly_add(next_states, joined, poly)
+            # times (k - len(classes))
+            new_color = [0] + poly
+            for d, c in enumerate(poly):
+                new_color[d] -= len(classes) * c
+            _poly_add(next_states, classes + ((face,),), new_color)
+
+        states = {}
+        for classes, poly in next_states.items():
+            frontier = (
+                tuple(f for f in cls if last_nbr_position[f] > i) for cls in classes
+            )
+            _poly_add(states, tuple(sorted(cls for cls in frontier if cls)), poly)
+
+    (coeffs,) = states.values()
+    return coeffs
+
+
+def evaluate_polynomial(coeffs: Sequence[int], k: int) -> int:
+    """Value at `k` of the polynomial with coefficients `coeffs` (lowest degree first), by Horner's rule."""
+    value = 0
+    for c in reversed(coeffs):
+        value = value * k + c
+    return value
+
+
+def proper_coloring_probabilities(
+    adjacency: Adjacency, ks: Iterable[int]
+) -> Dict[int, Fraction]:
+    """Exact probability that a uniformly random `k`-coloring is proper, `P(k) / k^faces`, for each `k`
+    in `ks`; the chromatic polynomial is computed once and evaluated per `k`.
+    """
+    coeffs = chromatic_polynomial(adjacency=adjacency)
+    return {
+        k: Fraction(evaluate_polynomial(coeffs, k=k), k ** len(adjacency)) for k in ks
+    }
+
+
+def _cycles(perm: Sequence[int]) -> List[List[int]]:
+    seen, cycles = set(), []
+    for start in range(len(perm)):
+        if start in seen:
+            continue
+        cycle, f = [], start
+        while f not in seen:
+            seen.add(f)
+            cycle.append(f)
+            f = perm[f]
+        cycles.append(cycle)
+    return cycles
+
+
+def count_distinct_colorings(poly: Polyhedron, k: int, proper: bool = True) -> int:
+    """Colorings of `poly` with `k` colors counted up to rotation, by Burnside's lemma: the average over
+    rotations `g` of the colorings fixed by `g`. A fixed coloring is constant on each cycle of `g`, so
+    it is a coloring of the quotient graph on cycles (none if a cycle contains two adjacent faces).
+
+    Args:
+        poly (Polyhedron): Polyhedron.
+        k (int): Number of colors.
+        proper (bool, optional): Count only colorings with no adjacent faces the same color. Defaults to `True`.
+
+    Returns:
+        int: Number of rotation classes of colorings.
+    """
+    group = rotation_group(poly=poly)
+    total = 0
+    for perm in group:
+        cycles = _cycles(perm=perm)
+        if not proper:
+            total += k ** len(cycles)
+            continue
+        cycle_of = {f: i for i, cycle in enumerate(cycles) for f in cycle}
+        quotient = [set() for _ in cycles]
+        for f, nbrs in enumerate(poly.adjacency):
+            for nbr in nbrs:
+                quotient[cycle_of[f]].add(cycle_of[nbr])
+        if any(i in nbrs for i, nbrs in enumerate(quotient)):
+            continue
+        total += evaluate_polynomial(chromatic_polynomial(adjacency=quotient), k=k)
+    return total // len(group)
@@ -0,0 +1,401 @@
+import json
+import os
+
+import numpy as np
+
+from array import array
+from collections import deque
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+DRAIN = -1
+
+# (from container, to container or `DRAIN`)
+Move = Tuple[int, int]
+# (amounts, move to reach amounts or `None` for the start, amount poured)
+PathStep = Tuple[Tuple[int, ...], Optional[Move], int]
+# `(m, num containers)` array of amounts -> `(m,)` bool mask
+AmountsPredicate = Callable[[np.ndarray], np.ndarray]
+
+
+class PouringPuzzle:
+    capacities: Tuple[int, ...]
+    can_drain: bool
+    strides: Tuple[int, ...]
+    num_states: int
+    moves: List[Move]
+
+    def __init__(self, capacities: Sequence[int], can_drain: Optional[bool] = True):
+        """Pouring puzzle over containers with given capacities: each move pours one container into
+        another until the first is empty or the second is full, or (if `can_drain`) empties a container.
+
+        States are packed into integers in mixed radix (`code = sum(amounts[k] * strides[k])`), so
+        visited/predecessor tables are flat arrays of `num_states = prod(capacities[k] + 1)` entries.
+
+        Args:
+            capacities (Sequence[int]): Capacity of each container.
+            can_drain (Optional[bool], optional): Whether containers may be emptied onto the ground. Defaults to `True`.
+        """
+        self.capacities = tuple(capacities)
+        self.can_drain = can_drain
+        strides, stride = [], 1
+        for cap in self.capacities:
+            strides.append(stride)
+            stride *= cap + 1
+        self.strides = tuple(strides)
+        self.num_states = stride
+
+        n = len(self.capacities)
+        self.moves = [(i, j) for i in range(n) for j in range(n) if i != j]
+        if can_drain:
+            self.moves += [(i, DRAIN) for i in range(n)]
+
+    def new_table(self) -> array:
+        """Flat table of `num_states` state codes, all `-1`; 4-byte entries when codes fit."""
+        return array("i" if self.num_states < 1 << 31 else "q", [-1]) * self.num_states
+
+    def encode(self, amounts: Sequence[int]) -> int:
+        return sum(amt * stride for amt, stride in zip(amounts, self.strides))
+
+    def decode(self, code: int) -> Tuple[int, ...]:
+        amounts = []
+        for cap in self.capacities:
+            code, amt = divmod(code, cap + 1)
+            amounts.append(amt)
+        return tuple(amounts)
+
+    def neighbors(self, code: int, amounts: Sequence[int]) -> Iterator[int]:
+        """Codes of states one move from `code` (whose decoding is `amounts`)."""
+        caps, strides = self.capacities, self.strides
+        for i, j in self.moves:
+            amt = amounts[i]
+            if amt == 0:
+                continue
+            if j == DRAIN:
+                yield code - amt * strides[i]
+                continue
+            amt = min(amt, caps[j] - amounts[j])
+            if amt > 0:
+                yield code + amt * (strides[j] - strides[i])
+
+    def predecessors(self, code: int, amounts: Sequence[int]) -> Iterator[int]:
+        """Codes of states from which one move reaches `code` (whose decoding is `amounts`).
+        A pour `i -> j` of `amt` ends with `i` empty or `j` full; a drain of `i` ends with `i` empty.
+        """
+        caps, strides = self.capacities, self.strides
+        for i, j in self.moves:
+            if j == DRAIN:
+                if amounts[i] == 0:
+                    for amt in range(1, caps[i] + 1):
+                        yield code + amt * strides[i]
+                continue
+            # amounts moved back from `j` to `i`
+            if amounts[i] != 0 and amounts[j] != caps[j]:
+                continue
+            for amt in range(1, min(amounts[j], caps[i] - amounts[i]) + 1):
+                yield code + amt * (strides[i] - strides[j])
+
+    def step_between(self, prev_code: int, code: int) -> PathStep:
+        """Path step (with the move and amount poured) for the move from `prev_code` to `code`."""
+        prev_amounts, amounts = self.decode(prev_code), self.decode(code)
+        diff = [b - a for a, b in zip(prev_amounts, amounts)]
+        i = next(k for k, d in enumerate(diff) if d < 0)
+        j = next((k for k, d in enumerate(diff) if d > 0), DRAIN)
+        return amounts, (i, j), -diff[i]
+
+    def _path(self, codes: List[int]) -> List[PathStep]:
+        path = [(self.decode(codes[0]), None, 0)]
+        for prev_code, code in zip(codes, codes[1:]):
+            path.append(self.step_between(prev_code=prev_code, code=code))
+        return path
+
+    def decode_all(self, codes: np.ndarray) -> np.ndarray:
+        """Vectorized `decode()`: `(m,)` codes -> `(m, num containers)` amounts."""
+        return np.stack(
+            [
+                (codes // stride) % (cap + 1)
+                for cap, stride in zip(self.capacities, self.strides)
+            ],
+            axis=-1,
+        )
+
+    def explore(self, start: Sequence[int]) -> "ReachabilityTable":
+        """One complete BFS from amounts `start`, tabulating distance and predecessor of every reachable state.
+        @see `ReachabilityTable`
+        """
+        start_code = self.encode(start)
+        pred, dist = self.new_table(), array("i", [-1]) * self.num_states
+        pred[start_code], dist[start_code] = start_code, 0
+        q = deque([start_code])
+        while q:
+            code = q.popleft()
+            next_dist = dist[code] + 1
+            for next_code in self.neighbors(code=code, amounts=self.decode(code)):
+                if pred[next_code] < 0:
+                    pred[next_code], dist[next_code] = code, next_dist
+                    q.append(next_code)
+        return ReachabilityTable(
+            puzzle=self,
+            start=tuple(start),
+            dist=np.frombuffer(dist, dtype=np.int32),
+            pred=np.frombuffer(pred, dtype=np.dtype(pred.typecode)),
+        )
+
+    def search(
+        self,
+        start: Sequence[int],
+        is_target: Callable[[Tuple[int, ...]], bool],
+    ) -> List[PathStep]:
+        """BFS for a shortest sequence of moves from amounts `start` to amounts satisfying `is_target`.
+
+        Args:
+            start (Sequence[int]): Initial amount in each container.
+            is_target (Callable[[Tuple[int, ...]], bool]): Callback for search terminating condition.
+
+        Returns:
+            List[PathStep]: Shortest path of `(amounts, move, amount poured)` steps, or `[]` if none exists.
+        """
+        start_code = self.encode(start)
+        pred = self.new_table()
+        pred[start_code] = start_code
+        q = deque([start_code])
+        while q:
+            code = q.popleft()
+            amounts = self.decode(code)
+            if is_target(amounts):
+                return self._path(codes=self._walk(pred=pred, code=code)[::-1])
+            for next_code in self.neighbors(code=code, amounts=amounts):
+                if pred[next_code] < 0:
+                    pred[next_code] = code
+                    q.append(next_code)
+        return []
+
+    def step_all(
+        self, codes: np.ndarray, backward: Optional[bool] = False
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized `neighbors()` (or `predecessors()` if `backward`) of every state in `codes`,
+        computed in mixed radix from the decoded amounts of the whole batch at once.
+
+        Args:
+            codes (np.ndarray): `(m,)` state codes.
+            backward (Optional[bool], optional): Step to predecessors instead. Defaults to `False`.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Codes one move away, and the index into `codes` of the state each is next to.
+        """
+        caps, strides = self.capacities, self.strides
+        amounts = self.decode_all(codes=codes)
+        next_codes, origins = [], []
+        for i, j in self.moves:
+            delta = -strides[i] if j == DRAIN else strides[j] - strides[i]
+            if not backward:
+                amt = amounts[:, i]
+                if j != DRAIN:
+                    amt = np.minimum(amt, caps[j] - amounts[:, j])
+                idx = np.flatnonzero(amt > 0)
+                amt = amt[idx]
+            else:
+                # a pour `i -> j` ends with `i` empty or `j` full; a drain of `i` with `i` empty
+                if j == DRAIN:
+                    counts = np.where(amounts[:, i] == 0, caps[i], 0)
+                else:
+                    counts = np.where(
+                        (amounts[:, i] == 0) | (amounts[:, j] == caps[j]),
+                        np.minimum(amounts[:, j], caps[i] - amounts[:, i]),
+                        0,
+                    )
+                # amounts moved back: `1, ..., counts[k]` for each state `k`
+                idx = np.repeat(np.arange(len(codes)), counts)
+                amt = np.arange(len(idx)) - np.repeat(
+                    np.cumsum(counts) - counts, counts
+                )
+                amt, delta = amt + 1, -delta
+            next_codes.append(codes[idx] + amt * delta)
+            origins.append(idx)
+        return np.concatenate(next_codes), np.concatenate(origins)
+
+    def bidirectional_search(
+        self, start: Sequence[int], goals: Iterable[Sequence[int]]
+    ) -> List[PathStep]:
+        """Shortest path from amounts `start` to any of the explicit `goals`, by BFS from both ends.
+        The backward search enumerates predecessor states, and each round expands the smaller frontier
+        a whole level at a time (@see `step_all()`). Visited states are kept as sorted code arrays per
+        level, so memory follows what the two searches reach rather than `num_states`.
+
+        Args:
+            start (Sequence[int]): Initial amount in each container.
+            goals (Iterable[Sequence[int]]): Target amounts.
+
+        Returns:
+            List[PathStep]: Shortest path of `(amounts, move, amount poured)` steps, or `[]` if none exists.
+        """
+        start_code = self.encode(start)
+        goal_codes = np.unique(
+            np.array([self.encode(goal) for goal in goals], dtype=np.int64)
+        )
+        if start_code in goal_codes:
+            return self._path(codes=[start_code])
+
+        # levels[side][d] = (sorted codes first reached in `d` moves from that side, the code each was reached from)
+        roots = (np.array([start_code], dtype=np.int64), goal_codes)
+        levels = ([(roots[0], roots[0])], [(roots[1], roots[1])])
+        seen = list(roots)
+
+        while len(levels[0][-1][0]) and len(levels[1][-1][0]):
+            side = 0 if len(levels[0][-1][0]) <= len(levels[1][-1][0]) else 1
+            frontier = levels[side][-1][0]
+            next_codes, origins = self.step_all(codes=frontier, backward=side == 1)
+            next_codes, first = np.unique(next_codes, return_index=True)
+            is_new = ~np.isin(next_codes, seen[side], assume_unique=True)
+            next_codes = next_codes[is_new]
+            levels[side].append((next_codes, frontier[origins[first[is_new]]]))
+            seen[side] = np.union1d(seen[side], next_codes)
+
+            meets = next_codes[np.isin(next_codes, seen[1 - side], assume_unique=True)]
+            if len(meets):
+                # all meeting states are equally far from this side: pick the closest to the other
+                depth, meet = next(
+                    (depth, hits[0])
+                    for depth, (level_codes, _) in enumerate(levels[1 - side])
+                    for hits in [meets[np.isin(meets, level_codes, assume_unique=True)]]
+                    if len(hits)
+                )
+                depths = (
+                    (len(levels[0]) - 1, depth)
+                    if side == 0
+                    else (depth, len(levels[1]) - 1)
+                )
+                codes = self._walk_levels(levels[0], code=meet, depth=depths[0])
+                return self._path(
+                    codes=codes[::-1]
+                    + self._walk_levels(levels[1], code=meet, depth=depths[1])[1:]
+                )
+        return []
+
+    @staticmethod
+    def _walk_levels(
+        levels: List[Tuple[np.ndarray, np.ndarray]], code: int, depth: int
+    ) -> List[int]:
+        """Codes from `code` (in `levels[depth]`) back to the search root, following each level's links."""
+        codes = [int(code)]
+        for level_codes, links in levels[depth:0:-1]:
+            code = links[np.searchsorted(level_codes, code)]
+            codes.append(int(code))
+        return codes
+
+    @staticmethod
+    def _walk(pred: Sequence[int], code: int) -> List[int]:
+        """Codes following `pred` links from `code` to the root (which links to itself)."""
+        codes = [code]
+        while pred[code] != code:
+            code = int(pred[code])
+            codes.append(code)
+        return codes
+
+
+class ReachabilityTable:
+    puzzle: PouringPuzzle
+    start: Tuple[int, ...]
+    dist: np.ndarray
+    pred: np.ndarray
+
+    def __init__(
+        self,
+        puzzle: PouringPuzzle,
+        start: Tuple[int, ...],
+        dist: np.ndarray,
+        pred: np.ndarray,
+    ):
+        """Fewest moves to, and BFS predecessor of, every state from `start`, indexed by state code
+        (`-1` for unreachable states). Answers any target query and rebuilds paths without searching.
+
+        Args:
+            puzzle (PouringPuzzle): Puzzle the table was built for.
+            start (Tuple[int, ...]): Initial amounts.
+            dist (np.ndarray): `(num_states,)` fewest moves to each state.
+            pred (np.ndarray): `(num_states,)` predecessor code of each state (`start` links to itself).
+        """
+        self.puzzle = puzzle
+        self.start = start
+        self.dist = dist
+        self.pred = pred
+
+    def reachable(self) -> np.ndarray:
+        """Codes of all reachable states."""
+        return np.flatnonzero(self.dist >= 0)
+
+    def distance(self, amounts: Sequence[int]) -> int:
+        """Fewest moves to reach `amounts`, or `-1` if unreachable."""
+        return int(self.dist[self.puzzle.encode(amounts)])
+
+    def path_to(self, amounts: Sequence[int]) -> List[PathStep]:
+        """Shortest path to `amounts`, or `[]` if unreachable."""
+        code = self.puzzle.encode(amounts)
+        if self.dist[code] < 0:
+            return []
+        codes = PouringPuzzle._walk(pred=self.pred, code=code)[::-1]
+        return self.puzzle._path(codes=codes)
+
+    def query(self, is_target: AmountsPredicate) -> List[PathStep]:
+        """Shortest path to any reachable state satisfying vectorized `is_target`, or `[]` if none does.
+
+        Args:
+            is_target (Callable[[np.ndarray], np.ndarray]): Maps `(m, num containers)` amounts to a `(m,)` bool mask.
+
+        Returns:
+            List[PathStep]: Shortest path of `(amounts, move, amount poured)` steps.
+        """
+        codes = self.reachable()
+        codes = codes[is_target(self.puzzle.decode_all(codes=codes))]
+        if len(codes) == 0:
+            return []
+        return self.path_to(self.puzzle.decode(int(codes[np.argmin(self.dist[codes])])))
+
+    def min_distances(self, containers: Sequence[int]) -> np.ndarray:
+        """Fewest moves to reach each combination of amounts in `containers` (any amounts elsewhere).
+
+        ex. `min_distances([1, 2])[a, b]` = fewest pours leaving `a` in container 1 and `b` in container 2.
+
+        Args:
+            containers (Sequence[int]): Container indices.
+
+        Returns:
+            np.ndarray: Array of shape `(capacities[k] + 1 for k in containers)`, `-1` where unreachable.
+        """
+        codes = self.reachable()
+        amounts = self.puzzle.decode_all(codes=codes)[:, list(containers)]
+        shape = tuple(self.puzzle.capacities[k] + 1 for k in containers)
+        res = np.full(shape, np.iinfo(np.int32).max, dtype=np.int32)
+        np.minimum.at(res, tuple(amounts.T), self.dist[codes])
+        res[res == np.iinfo(np.int32).max] = -1
+        return res
+
+    def save(self, path: str):
+        """Save to directory `path` as `.npy` arrays (memory-mappable by `load()`) plus puzzle metadata."""
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, "dist.npy"), self.dist)
+        np.save(os.path.join(path, "pred.npy"), self.pred)
+        with open(os.path.join(path, "meta.json"), "w") as f:
+            json.dump(
+                {
+                    "capacities": self.puzzle.capacities,
+                    "can_drain": self.puzzle.can_drain,
+                    "start": self.start,
+                },
+                f,
+            )
+
+    @classmethod
+    def load(cls, path: str, mmap: Optional[bool] = True) -> "ReachabilityTable":
+        """Load a table saved by `save()`, memory-mapping the arrays by default so queries read only what they touch."""
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        mmap_mode = "r" if mmap else None
+        return cls(
+            puzzle=PouringPuzzle(
+                capacities=meta["capacities"], can_drain=meta["can_drain"]
+            ),
+            start=tuple(meta["start"]),
+            dist=np.load(os.path.join(path, "dist.npy"), mmap_mode=mmap_mode),
+            pred=np.load(os.path.join(path, "pred.npy"), mmap_mode=mmap_mode),
+        )
@@ -0,0 +1,189 @@
+import numpy as np
+
+from scipy.stats import qmc
+from typing import Callable, Optional, Sequence, Tuple, Union
+
+from .stats import RunningStats
+from .variance import UniformFn
+
+
+QMC_METHODS = ["sobol", "halton"]
+
+
+def make_sampler(
+    dims: int,
+    method: Optional[str] = "sobol",
+    scramble: Optional[bool] = True,
+    seed: Optional[Union[int, np.random.Generator]] = None,
+) -> qmc.QMCEngine:
+    """Create low-discrepancy sequence generator over `[0, 1)^dims`.
+
+    Args:
+        dims (int): Dimension of each point.
+        method (Optional[str], optional): One of `QMC_METHODS`. Defaults to `"sobol"`.
+        scramble (Optional[bool], optional): Randomize the sequence (Owen scrambling for Sobol,
+         permutation scrambling for Halton), keeping low discrepancy. Defaults to `True`.
+        seed (Optional[Union[int, np.random.Generator]], optional): Seed for scrambling. Defaults to unseeded.
+
+    Returns:
+        qmc.QMCEngine: Sequence generator; successive `.random(n)` calls continue the sequence.
+    """
+    if method == "sobol":
+        return qmc.Sobol(d=dims, scramble=scramble, seed=seed)
+    if method == "halton":
+        return qmc.Halton(d=dims, scramble=scramble, seed=seed)
+    raise ValueError(f"unknown method={method}, expected one of {QMC_METHODS}")
+
+
+def scale_to_bounds(u: np.ndarray, bounds: Sequence[Tuple[float, float]]) -> np.ndarray:
+    """Map `(n, d)` points in `[0, 1)^d` to the box `bounds[0] PROD ... PROD bounds[d-1]`."""
+    lo, hi = np.asarray(bounds, dtype=float).T
+    return lo + u * (hi - lo)
+
+
+def qmc_points(
+    n: int,
+    bounds: Sequence[Tuple[float, float]],
+    method: Optional[str] = "sobol",
+    scramble: Optional[bool] = True,
+    seed: Optional[int] = None,
+) -> np.ndarray:
+    """Block of `n` low-discrepancy points in the box given by per-dimension `(min, max)` bounds.
+    Sobol points are best balanced when `n` is a power of 2.
+
+    @see `make_sampler()`
+
+    Args:
+        n (int): Number of points.
+        bounds (Sequence[Tuple[float, float]]): `(min, max)` bounds for each dimension.
+        method (Optional[str], optional): One of `QMC_METHODS`. Defaults to `"sobol"`.
+        scramble (Optional[bool], optional): Randomize the sequence. Defaults to `True`.
+        seed (Optional[int], optional): Seed for scrambling. Defaults to unseeded.
+
+    Returns:
+        np.ndarray: `(n, len(bounds))` array of points.
+    """
+    sampler = make_sampler(
+        dims=len(bounds), method=method, scramble=scramble, seed=seed
+    )
+    return scale_to_bounds(u=sampler.random(n), bounds=bounds)
+
+
+class QmcPointSource:
+    sampler: qmc.QMCEngine
+    bounds: Sequence[Tuple[float, float]]
+    block_size: int
+
+    def __init__(
+        self,
+        x_bd: Optional[Tuple[int, int]] = (0, 1),
+        y_bd: Optional[Tuple[int, int]] = (0, 1),
+        method: Optional[str] = "sobol",
+        scramble: Optional[bool] = True,
+        seed: Optional[int] = None,
+        block_size: Optional[int] = 1 << 12,
+    ):
+        """Quasi-random drop-in for `utils.sim.choose_point`/`choose_points`: successive calls
+        continue one low-discrepancy sequence over `x_bd PROD y_bd`.
+
+        Args:
+            x_bd (Optional[Tuple[int, int]], optional): Min/max bounds for `x`. Defaults to `(0, 1)`.
+            y_bd (Optional[Tuple[int, int]], optional): Min/max bounds for `y`. Defaults to `(0, 1)`.
+            method (Optional[str], optional): One of `QMC_METHODS`. Defaults to `"sobol"`.
+            scramble (Optional[bool], optional): Randomize the sequence. Defaults to `True`.
+            seed (Optional[int], optional): Seed for scrambling. Defaults to unseeded.
+            block_size (Optional[int], optional): Points generated at a time for `choose_point`. Defaults to 4096.
+        """
+        self.sampler = make_sampler(dims=2, method=method, scramble=scramble, seed=seed)
+        self.bounds = [x_bd, y_bd]
+        self.block_size = block_size
+        self._block = np.empty((0, 2))
+        self._block_idx = 0
+
+    def choose_point(self) -> Tuple[float, float]:
+        """Next point of the sequence. @see `utils.sim.choose_point()`"""
+        if self._block_idx >= len(self._block):
+            self._block = scale_to_bounds(
+                u=self.sampler.random(self.block_size), bounds=self.bounds
+            )
+            self._block_idx = 0
+        x, y = self._block[self._block_idx]
+        self._block_idx += 1
+        return float(x), float(y)
+
+    def choose_points(self, n: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Next `n` points of the sequence, starting with any left in `choose_point()`'s block.
+        @see `utils.sim.choose_points()`
+        """
+        buffered = self._block[self._block_idx : self._block_idx + n]
+        self._block_idx += len(buffered)
+        pts = buffered
+        if len(buffered) < n:
+            fresh = scale_to_bounds(
+                u=self.sampler.random(n - len(buffered)), bounds=self.bounds
+            )
+            pts = np.concatenate([buffered, fresh])
+        return pts[:, 0], pts[:, 1]
+
+
+def run_qmc_backend(
+    simulate_qmc: Callable[..., RunningStats],
+    num_samples: Optional[int] = None,
+    trials_per_sample: Optional[int] = None,
+    seed: Optional[int] = None,
+    workers: Optional[int] = 1,
+    **sim_kwargs,
+) -> RunningStats:
+    """Serve a problem's `simulate(backend="qmc")` with its `simulate_qmc(n, replicates, seed)`:
+    `num_samples` replicates of `trials_per_sample` points, rounded up to a power of 2 so Sobol
+    points stay balanced; `simulate_qmc()`'s own defaults for either one left unset.
+
+    Replicates run in one process, uncached and without checkpoints, so `workers` other than 1 and
+    any other `run_sims_and_report()` options are rejected rather than ignored.
+
+    Raises:
+        ValueError: On options the backend does not support.
+    """
+    unsupported = sorted(sim_kwargs) + (["workers"] if workers != 1 else [])
+    if unsupported:
+        raise ValueError(f'backend="qmc" does not support {", ".join(unsupported)}')
+    kwargs = {}
+    if num_samples is not None:
+        kwargs["replicates"] = num_samples
+    if trials_per_sample is not None:
+        kwargs["n"] = 1 << max(trials_per_sample - 1, 0).bit_length()
+    return simulate_qmc(seed=seed, **kwargs)
+
+
+def qmc_replicates(
+    f: UniformFn,
+    dims: int,
+    n: int,
+    replicates: Optional[int] = 16,
+    method: Optional[str] = "sobol",
+    seed: Optional[int] = None,
+    res_map: Optional[Callable[[float], float]] = lambda x: x,
+) -> RunningStats:
+    """Randomized quasi-Monte Carlo: estimate `E[f(U)]` with `n` points from each of `replicates`
+    independently scrambled sequences. Each replicate is unbiased and they are i.i.d., so the
+    returned statistics give valid standard errors and confidence intervals.
+
+    Args:
+        f (Callable[[np.ndarray], np.ndarray]): Experiment as a function of `(n, dims)` uniforms.
+        dims (int): Dimension of uniforms consumed per evaluation.
+        n (int): Points per replicate (power of 2 for Sobol).
+        replicates (Optional[int], optional): Number of independent scramblings. Defaults to 16.
+        method (Optional[str], optional): One of `QMC_METHODS`. Defaults to `"sobol"`.
+        seed (Optional[int], optional): Master seed for the scramblings. Defaults to unseeded.
+        res_map (Optional[Callable[[float], float]], optional): Map applied to each replicate's estimate. Defaults to identity.
+
+    Returns:
+        RunningStats: Statistics of the `replicates` estimates.
+    """
+    stats = RunningStats()
+    for replicate_seed in np.random.SeedSequence(seed).spawn(replicates):
+        sampler = make_sampler(
+            dims=dims, method=method, seed=np.random.default_rng(replicate_seed)
+        )
+        stats.update(res_map(float(np.mean(f(sampler.random(n))))))
+    return stats
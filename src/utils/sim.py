@@ -1,8 +1,23 @@
+import math
+import multiprocessing as mp
+import os
+import pickle
 import random
-import statistics
 
+import numpy as np
+
+from statistics import NormalDist
 from tqdm import tqdm
-from typing import Callable, Optional, Tuple, Union
+from typing import Callable, Iterator, NamedTuple, Optional, Tuple, Union
+
+from .cache import ResultCache, code_version, dump_atomic, make_key
+from .stats import RunningStats
+
+
+TrialFn = Callable[[], Union[bool, int, float]]
+BatchTrialFn = Callable[[np.random.Generator, int], np.ndarray]
+
+DEFAULT_BATCH_SIZE = 1 << 16
 
 
 def choose_point(
@@ -25,7 +40,34 @@ def choose_point(
     )
 
 
-def run_single_sample(fn: Callable[[], Union[bool, int, float]], trials: int) -> float:
+def choose_points(
+    rng: np.random.Generator,
+    n: int,
+    x_bd: Optional[Tuple[int, int]] = (0, 1),
+    y_bd: Optional[Tuple[int, int]] = (0, 1),
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Batched `choose_point`: uniformly randomly select `n` points `(x,y)` from given bounds.
+
+    @see `choose_point()`
+
+    Args:
+        rng (np.random.Generator): Source of randomness.
+        n (int): Number of points to select.
+        x_bd (Optional[Tuple[int, int]], optional): Min/max bounds for `x`. Defaults to `(0, 1)`.
+        y_bd (Optional[Tuple[int, int]], optional): Min/max bounds for `y`. Defaults to `(0, 1)`.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: `(xs, ys)` arrays of length `n`.
+    """
+
+    x_min, x_max = x_bd
+    y_min, y_max = y_bd
+    return x_min + rng.random(n) * (x_max - x_min), y_min + rng.random(n) * (
+        y_max - y_min
+    )
+
+
+def run_single_sample(fn: TrialFn, trials: int) -> float:
     """Run `trials` trials of `fn`, tracking average value.
 
     Args:
@@ -47,28 +89,493 @@ def run_single_sample(fn: Callable[[], Union[bool, int, float]], trials: int) ->
     return total / trials
 
 
+def run_batched_sample(
+    batch_fn: BatchTrialFn,
+    trials: int,
+    rng: np.random.Generator,
+    batch_size: Optional[int] = DEFAULT_BATCH_SIZE,
+) -> float:
+    """Run `trials` trials of `batch_fn` in batches of at most `batch_size`, tracking average value.
+
+    Args:
+        batch_fn (Callable[[np.random.Generator, int], np.ndarray]): Batched experiment runnable.
+         Given `(rng, size)`, returns array of `size` trial outcomes (bool array for Bernoulli processes).
+        trials (int): Number of trials to run.
+        rng (np.random.Generator): Source of randomness passed to `batch_fn`.
+        batch_size (Optional[int], optional): Max trials per `batch_fn` call. Defaults to `DEFAULT_BATCH_SIZE`.
+
+    Returns:
+        float: Average value across run trials.
+    """
+
+    total = 0.0
+    remaining = trials
+    while remaining > 0:
+        size = min(batch_size, remaining)
+        total += float(np.sum(batch_fn(rng, size), dtype=np.float64))
+        remaining -= size
+    return total / trials
+
+
+def sample_seed_sequence(seed: int, sample_idx: int) -> np.random.SeedSequence:
+    """Derive the independent random stream for one sample of a run from the run's master seed.
+    Depends only on `(seed, sample_idx)`, so sample results do not depend on which worker runs them.
+
+    Args:
+        seed (int): Master seed of the run.
+        sample_idx (int): Index of the sample within the run.
+
+    Returns:
+        np.random.SeedSequence: Seed sequence for sample `sample_idx`.
+    """
+    return np.random.SeedSequence(entropy=seed, spawn_key=(sample_idx,))
+
+
+def run_seeded_sample(
+    fn: Optional[TrialFn],
+    batch_fn: Optional[BatchTrialFn],
+    trials: int,
+    seed: int,
+    sample_idx: int,
+) -> float:
+    """Run sample `sample_idx` of a run with master `seed`, using `fn` (seeds `random`) or `batch_fn`.
+
+    @see `sample_seed_sequence()`
+
+    Args:
+        fn (Optional[Callable[[], Union[bool, int, float]]]): Single experiment trial runnable, or `None` if `batch_fn` given.
+        batch_fn (Optional[Callable[[np.random.Generator, int], np.ndarray]]): Batched experiment runnable, or `None` if `fn` given.
+        trials (int): Number of trials to run.
+        seed (int): Master seed of the run.
+        sample_idx (int): Index of the sample within the run.
+
+    Returns:
+        float: Average value across run trials.
+    """
+    seed_seq = sample_seed_sequence(seed=seed, sample_idx=sample_idx)
+    if batch_fn is not None:
+        return run_batched_sample(
+            batch_fn=batch_fn, trials=trials, rng=np.random.default_rng(seed_seq)
+        )
+    random.seed(int(seed_seq.generate_state(1, dtype=np.uint64)[0]))
+    return run_single_sample(fn=fn, trials=trials)
+
+
+# per-process (fn, batch_fn, trials, seed), set by `_init_worker()` in each pool worker
+_worker_args: Optional[
+    Tuple[Optional[TrialFn], Optional[BatchTrialFn], int, int]
+] = None
+
+
+def _init_worker(
+    fn: Optional[TrialFn], batch_fn: Optional[BatchTrialFn], trials: int, seed: int
+):
+    global _worker_args
+    _worker_args = (fn, batch_fn, trials, seed)
+
+
+def _run_worker_sample(sample_idx: int) -> float:
+    fn, batch_fn, trials, seed = _worker_args
+    return run_seeded_sample(
+        fn=fn, batch_fn=batch_fn, trials=trials, seed=seed, sample_idx=sample_idx
+    )
+
+
+def iter_sample_results(
+    fn: Optional[TrialFn],
+    batch_fn: Optional[BatchTrialFn],
+    num_samples: int,
+    trials_per_sample: int,
+    seed: int,
+    workers: int = 1,
+    start_idx: int = 0,
+) -> Iterator[float]:
+    """Yield raw results of samples `start_idx, ..., num_samples - 1` in order, running them on `workers` processes.
+    Workers are forked where possible so `fn`/`batch_fn` may be lambdas; otherwise they must be picklable.
+
+    Args:
+        fn (Optional[Callable[[], Union[bool, int, float]]]): Single experiment trial runnable, or `None` if `batch_fn` given.
+        batch_fn (Optional[Callable[[np.random.Generator, int], np.ndarray]]): Batched experiment runnable, or `None` if `fn` given.
+        num_samples (int): Size of sample.
+        trials_per_sample (int): Number of trials to run per sample.
+        seed (int): Master seed of the run.
+        workers (int, optional): Number of processes. Defaults to 1 (run in this process).
+        start_idx (int, optional): Index of first sample to run. Defaults to 0.
+
+    Yields:
+        float: Average value across trials of each sample.
+    """
+
+    if workers <= 1:
+        for sample_idx in range(start_idx, num_samples):
+            yield run_seeded_sample(
+                fn=fn,
+                batch_fn=batch_fn,
+                trials=trials_per_sample,
+                seed=seed,
+                sample_idx=sample_idx,
+            )
+        return
+
+    start_method = "fork" if "fork" in mp.get_all_start_methods() else None
+    chunksize = max(1, (num_samples - start_idx) // (workers * 8))
+    with mp.get_context(start_method).Pool(
+        processes=workers,
+        initializer=_init_worker,
+        initargs=(fn, batch_fn, trials_per_sample, seed),
+    ) as pool:
+        yield from pool.imap(
+            _run_worker_sample, range(start_idx, num_samples), chunksize=chunksize
+        )
+
+
+class Checkpoint(NamedTuple):
+    seed: int
+    trials_per_sample: int
+    samples_done: int
+    stats: RunningStats
+
+
+def save_checkpoint(path: str, checkpoint: Checkpoint):
+    dump_atomic(value=checkpoint, path=path)
+
+
+def load_checkpoint(path: str) -> Optional[Checkpoint]:
+    """Checkpoint saved at `path`, or `None` if there is none yet."""
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+
+
 def run_sims_and_report(
-    fn: Callable[[], Union[bool, int, float]],
+    fn: Optional[TrialFn] = None,
     num_samples: Optional[int] = 100,
     trials_per_sample: Optional[int] = 100,
     sample_res_map: Optional[Callable[[float], float]] = lambda x: x,
-):
+    batch_fn: Optional[BatchTrialFn] = None,
+    seed: Optional[int] = None,
+    workers: Optional[int] = 1,
+    cache: Optional[ResultCache] = None,
+    cache_key: Optional[str] = None,
+    checkpoint_path: Optional[str] = None,
+    checkpoint_every: Optional[int] = 10,
+    resume: Optional[bool] = False,
+) -> RunningStats:
     """Run `samples` rounds of `trials` trials of `fn`, compute + report sample aggregate statistics.
+    Exactly one of `fn` (scalar trial) or `batch_fn` (batched trials) must be given.
+
+    Each sample draws from its own random stream derived from `seed` (@see `sample_seed_sequence()`),
+    so a seeded run gives identical results for any number of `workers`. For the same reason, a seeded
+    run given a `cache` resumes from the statistics saved by an earlier run with the same `cache_key`,
+    seed and `trials_per_sample`, running only the samples it has not seen yet; a shorter run leaves a
+    longer cached one in place.
+
+    Likewise, with a `checkpoint_path` the accumulated statistics and the seed (which with the
+    sample index determines all remaining random streams) are saved every `checkpoint_every`
+    samples and when the run stops, and `resume=True` continues from the last checkpoint with the
+    same final result as an uninterrupted run.
 
     Args:
-        fn (Callable[[], Union[bool, int, float]]): Single experiment trial runnable.
+        fn (Optional[Callable[[], Union[bool, int, float]]], optional): Single experiment trial runnable.
          For Bernoulli processes, return `True` iff success.
         num_samples (Optional[int], optional): Size of sample. Defaults to 100.
         trials_per_sample (Optional[int], optional): Number of trials to run per sample. Defaults to 100.
         sample_res_map (Optional[Callable[[float], float]], optional): Additional map to apply to each sample result. Defaults to identity.
+        batch_fn (Optional[Callable[[np.random.Generator, int], np.ndarray]], optional): Batched experiment runnable.
+         @see `run_batched_sample()`
+        seed (Optional[int], optional): Master seed of the run. Defaults to fresh OS entropy.
+        workers (Optional[int], optional): Number of processes to spread samples across, or `None` for all cores. Defaults to 1.
+        cache (Optional[ResultCache], optional): Cache for partial sample statistics. Requires `seed`. Defaults to no caching.
+        cache_key (Optional[str], optional): Name of this experiment in `cache` (must identify `sample_res_map`;
+         the code version of `fn`/`batch_fn` is part of the key).
+        checkpoint_path (Optional[str], optional): File to checkpoint progress to. Defaults to no checkpointing.
+        checkpoint_every (Optional[int], optional): Samples between checkpoints. Defaults to 10.
+        resume (Optional[bool], optional): Continue from the checkpoint at `checkpoint_path`, if any,
+         taking its seed when `seed` is not given. Defaults to `False`.
+
+    Returns:
+        RunningStats: Streaming statistics of the (mapped) sample results.
+    """
+
+    if (fn is None) == (batch_fn is None):
+        raise ValueError("exactly one of fn, batch_fn must be given")
+    if cache is not None and (seed is None or cache_key is None):
+        raise ValueError("cache requires seed and cache_key")
+    if resume and checkpoint_path is None:
+        raise ValueError("resume requires checkpoint_path")
+
+    checkpoint = load_checkpoint(path=checkpoint_path) if resume else None
+    if checkpoint is not None:
+        if seed is None:
+            seed = checkpoint.seed
+        if (checkpoint.seed, checkpoint.trials_per_sample) != (seed, trials_per_sample):
+            raise ValueError(
+                f"checkpoint {checkpoint_path} is for seed={checkpoint.seed}, "
+                f"trials_per_sample={checkpoint.trials_per_sample}"
+            )
+        if checkpoint.samples_done > num_samples:
+            raise ValueError(
+                f"checkpoint {checkpoint_path} already has {checkpoint.samples_done} samples"
+            )
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    stats, start_idx = RunningStats(), 0
+    cached_samples = 0
+    if cache is not None:
+        accumulator_key = make_key(
+            problem=cache_key,
+            params={"seed": seed, "trials_per_sample": trials_per_sample},
+            version=code_version(batch_fn or fn),
+        )
+        saved = cache.load_accumulator(key=accumulator_key)
+        if saved is not None:
+            cached_samples = saved[1]
+        # a longer cached run cannot be cut back to `num_samples`; run afresh and keep it
+        if saved is not None and saved[1] <= num_samples:
+            stats.merge(saved[0])
+            start_idx = saved[1]
+    if checkpoint is not None and checkpoint.samples_done > start_idx:
+        stats, start_idx = RunningStats(), checkpoint.samples_done
+        stats.merge(checkpoint.stats)
+
+    progress = tqdm(
+        iter_sample_results(
+            fn=fn,
+            batch_fn=batch_fn,
+            num_samples=num_samples,
+            trials_per_sample=trials_per_sample,
+            seed=seed,
+            workers=workers,
+            start_idx=start_idx,
+        ),
+        initial=start_idx,
+        total=num_samples,
+    )
+    samples_done = start_idx
+    try:
+        for sample_res in progress:
+            stats.update(sample_res_map(sample_res))
+            samples_done += 1
+            progress.set_postfix(mean=stats.mean, stderr=stats.stderr, refresh=False)
+            if checkpoint_path is not None and samples_done % checkpoint_every == 0:
+                save_checkpoint(
+                    path=checkpoint_path,
+                    checkpoint=Checkpoint(seed, trials_per_sample, samples_done, stats),
+                )
+    finally:
+        # also on interruption, so a resumed run loses no completed samples
+        if checkpoint_path is not None:
+            save_checkpoint(
+                path=checkpoint_path,
+                checkpoint=Checkpoint(seed, trials_per_sample, samples_done, stats),
+            )
+    if cache is not None and num_samples > cached_samples:
+        cache.save_accumulator(
+            key=accumulator_key, stats=stats, samples_done=num_samples
+        )
+
+    lo, hi = stats.confidence_interval()
+    print(f"mean={stats.mean}, stdev={stats.stdev}, 95% CI=({lo}, {hi})")
+    return stats
+
+
+class PrecisionResult(NamedTuple):
+    estimate: float
+    interval: Tuple[float, float]
+    trials: int
+    reached_target: bool
+    stats: RunningStats
+
+
+def run_trial_stats(
+    fn: Optional[TrialFn],
+    batch_fn: Optional[BatchTrialFn],
+    trials: int,
+    seed_seq: np.random.SeedSequence,
+    batch_size: Optional[int] = DEFAULT_BATCH_SIZE,
+) -> RunningStats:
+    """Run `trials` trials of `fn` or `batch_fn` from stream `seed_seq`, accumulating per-trial statistics.
+
+    Args:
+        fn (Optional[Callable[[], Union[bool, int, float]]]): Single experiment trial runnable, or `None` if `batch_fn` given.
+        batch_fn (Optional[Callable[[np.random.Generator, int], np.ndarray]]): Batched experiment runnable, or `None` if `fn` given.
+        trials (int): Number of trials to run.
+        seed_seq (np.random.SeedSequence): Random stream for these trials.
+        batch_size (Optional[int], optional): Max trials per `batch_fn` call. Defaults to `DEFAULT_BATCH_SIZE`.
+
+    Returns:
+        RunningStats: Statistics of the individual trial outcomes.
+    """
+
+    stats = RunningStats()
+    if batch_fn is not None:
+        rng = np.random.default_rng(seed_seq)
+        remaining = trials
+        while remaining > 0:
+            size = min(batch_size, remaining)
+            stats.update_batch(batch_fn(rng, size))
+            remaining -= size
+    else:
+        random.seed(int(seed_seq.generate_state(1, dtype=np.uint64)[0]))
+        for _ in range(trials):
+            stats.update(fn())
+    return stats
+
+
+def run_until_precision(
+    fn: Optional[TrialFn] = None,
+    batch_fn: Optional[BatchTrialFn] = None,
+    target_stderr: Optional[float] = None,
+    target_half_width: Optional[float] = None,
+    confidence: Optional[float] = 0.95,
+    max_trials: Optional[int] = 10**8,
+    initial_trials: Optional[int] = 10000,
+    growth: Optional[float] = 2.0,
+    res_map: Optional[Callable[[float], float]] = lambda x: x,
+    seed: Optional[int] = None,
+) -> PrecisionResult:
+    """Run trials of `fn`/`batch_fn` in growing rounds until the estimate `res_map(mean)` reaches
+    `target_stderr` or `target_half_width`, or `max_trials` trials have been used.
+
+    The standard error of `res_map(mean)` is propagated from the trial mean by the delta method,
+    so e.g. targets for a pi estimator `2 / a` apply to pi rather than `a`. Each round is at most
+    `growth` times the trials so far, and never more than the current variance estimate projects
+    is still needed. While all outcomes are equal (e.g. no rare event seen yet) there is no variance
+    estimate, so rounds keep growing; if the budget runs out first, the target is not reached and the
+    interval is the rule-of-three bound (@see `_constant_outcome_interval()`).
+
+    Args:
+        fn (Optional[Callable[[], Union[bool, int, float]]], optional): Single experiment trial runnable.
+         For Bernoulli processes, return `True` iff success.
+        batch_fn (Optional[Callable[[np.random.Generator, int], np.ndarray]], optional): Batched experiment runnable.
+         @see `run_batched_sample()`
+        target_stderr (Optional[float], optional): Stop once standard error of the estimate is at most this (positive).
+        target_half_width (Optional[float], optional): Stop once confidence interval half-width is at most this (positive).
+        confidence (Optional[float], optional): Confidence level of reported interval. Defaults to 0.95.
+        max_trials (Optional[int], optional): Compute budget: never run more trials than this, at least 2. Defaults to 10^8.
+        initial_trials (Optional[int], optional): Size of first round, at least 2. Defaults to 10000.
+        growth (Optional[float], optional): Max factor (above 1) by which total trials grow per round. Defaults to 2.
+        res_map (Optional[Callable[[float], float]], optional): Map from trial mean to estimate. Defaults to identity.
+        seed (Optional[int], optional): Master seed: round `r` uses `sample_seed_sequence(seed, r)`. Defaults to fresh OS entropy.
+
+    Returns:
+        PrecisionResult: Estimate, confidence interval, trials used, whether target was reached, and raw trial statistics.
     """
 
-    sample_results = []
-    for _ in tqdm(range(num_samples)):
-        sample_results.append(
-            sample_res_map(run_single_sample(fn=fn, trials=trials_per_sample))
+    if (fn is None) == (batch_fn is None):
+        raise ValueError("exactly one of fn, batch_fn must be given")
+    if (target_stderr is None) == (target_half_width is None):
+        raise ValueError(
+            "exactly one of target_stderr, target_half_width must be given"
         )
+    target = target_stderr if target_stderr is not None else target_half_width
+    if not target > 0:
+        raise ValueError(f"target={target} must be positive")
+    if not 0 < confidence < 1:
+        raise ValueError(f"confidence={confidence} must be in (0, 1)")
+    if initial_trials < 2:
+        raise ValueError(f"initial_trials={initial_trials} must be at least 2")
+    if max_trials < 2:
+        raise ValueError(f"max_trials={max_trials} must be at least 2")
+    if not growth > 1:
+        raise ValueError(f"growth={growth} must be greater than 1")
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
 
-    print(
-        f"mean={statistics.mean(sample_results)}, stdev={statistics.stdev(sample_results)}"
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    target_stderr = (
+        target_stderr if target_stderr is not None else target_half_width / z
     )
+
+    stats = RunningStats()
+    round_idx, round_trials = 0, min(initial_trials, max_trials)
+    with tqdm(total=max_trials) as progress:
+        while True:
+            stats.merge(
+                run_trial_stats(
+                    fn=fn,
+                    batch_fn=batch_fn,
+                    trials=round_trials,
+                    seed_seq=sample_seed_sequence(seed=seed, sample_idx=round_idx),
+                )
+            )
+            progress.update(round_trials)
+            round_idx += 1
+
+            if stats.count < 2 or stats.m2 == 0:
+                # all outcomes equal (e.g. a rare event not seen yet): no variance estimate, so
+                # the target cannot be judged; grow the sample until one appears or the budget ends
+                reached_target = False
+                if stats.count >= max_trials:
+                    break
+                round_trials = min(
+                    max(math.ceil(stats.count * (growth - 1)), 1),
+                    max_trials - stats.count,
+                )
+                continue
+
+            estimate = res_map(stats.mean)
+            stderr = abs(_derivative(f=res_map, x=stats.mean)) * stats.stderr
+            progress.set_postfix(estimate=estimate, stderr=stderr, refresh=False)
+            reached_target = stderr <= target_stderr
+            if reached_target or stats.count >= max_trials:
+                break
+
+            # trials projected to reach target at current variance, capped by growth and budget
+            projected = math.ceil(stats.count * (stderr / target_stderr) ** 2)
+            round_trials = min(
+                max(projected - stats.count, 1),
+                max(math.ceil(stats.count * (growth - 1)), 1),
+                max_trials - stats.count,
+            )
+
+    if stats.count < 2 or stats.m2 == 0:
+        estimate = _safe_map(f=res_map, x=stats.mean)
+        lo, hi = _constant_outcome_interval(
+            value=stats.mean, n=stats.count, confidence=confidence
+        )
+        mapped = (_safe_map(f=res_map, x=lo), _safe_map(f=res_map, x=hi))
+        interval = (min(mapped), max(mapped))
+    else:
+        half_width = z * stderr
+        interval = (estimate - half_width, estimate + half_width)
+    return PrecisionResult(
+        estimate=estimate,
+        interval=interval,
+        trials=stats.count,
+        reached_target=reached_target,
+        stats=stats,
+    )
+
+
+def _constant_outcome_interval(
+    value: float, n: int, confidence: float
+) -> Tuple[float, float]:
+    """Interval for the trial mean when all `n` outcomes equal `value`, by the rule of three: with no
+    success in `n` Bernoulli trials, `p <= -ln(1 - confidence) / n` (`~3 / n` at 95%). All failures
+    (`value == 0`) bound the mean above, all successes (`value == 1`) below, anything else both ways.
+    """
+    bound = -math.log(1 - confidence) / n
+    if value == 0:
+        return value, bound
+    if value == 1:
+        return 1 - bound, value
+    return value - bound, value + bound
+
+
+def _safe_map(f: Callable[[float], float], x: float) -> float:
+    """`f(x)`, or `inf` where `f` is undefined (e.g. `2 / a` at `a = 0`)."""
+    try:
+        return f(x)
+    except (ZeroDivisionError, ValueError, OverflowError):
+        return math.inf
+
+
+def _derivative(f: Callable[[float], float], x: float) -> float:
+    h = 1e-6 * max(1.0, abs(x))
+    return (f(x + h) - f(x - h)) / (2 * h)
@@ -0,0 +1,128 @@
+import math
+
+import numpy as np
+
+from statistics import NormalDist
+from typing import Tuple, Union
+
+
+class RunningStats:
+    count: int
+    mean: float
+    m2: float
+    min: float
+    max: float
+
+    def __init__(self):
+        """Create empty streaming accumulator of count, mean, variance (Welford), min and max.
+        Uses constant memory regardless of how many values are added.
+        """
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, x: Union[bool, int, float]):
+        """Add a single value.
+
+        Args:
+            x (Union[bool, int, float]): Value to add.
+        """
+        x = float(x)
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        self.min = min(self.min, x)
+        self.max = max(self.max, x)
+
+    def update_batch(self, xs: np.ndarray):
+        """Add every value of `xs`: summarize the batch in one vectorized pass, then merge it in.
+
+        Args:
+            xs (np.ndarray): Values to add (bool arrays count successes as 1).
+        """
+        xs = np.asarray(xs, dtype=np.float64).ravel()
+        if xs.size == 0:
+            return
+        batch = RunningStats()
+        batch.count = int(xs.size)
+        batch.mean = float(xs.mean())
+        batch.m2 = float(np.sum((xs - batch.mean) ** 2))
+        batch.min = float(xs.min())
+        batch.max = float(xs.max())
+        self.merge(batch)
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        """Combine `other` into this accumulator in place (Chan et al. pairwise update), e.g. across workers.
+
+        Args:
+            other (RunningStats): Accumulator to fold in. Not modified.
+
+        Returns:
+            RunningStats: This accumulator.
+        """
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return self
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta**2 * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (`n - 1` denominator), or `nan` with fewer than two values."""
+        return self.m2 / (self.count - 1) if self.count > 1 else math.nan
+
+    @property
+    def stdev(self) -> float:
+        return math.sqrt(self.variance)
+
+    @property
+    def stderr(self) -> float:
+        """Standard error of the mean."""
+        return self.stdev / math.sqrt(self.count) if self.count > 1 else math.nan
+
+    def half_width(self, confidence: float = 0.95) -> float:
+        """Half-width of the normal-approximation confidence interval for the mean.
+
+        Args:
+            confidence (float, optional): Confidence level. Defaults to 0.95.
+
+        Returns:
+            float: `z * stderr`.
+        """
+        z = NormalDist().inv_cdf((1 + confidence) / 2)
+        return z * self.stderr
+
+    def confidence_interval(self, confidence: float = 0.95) -> Tuple[float, float]:
+        """Normal-approximation confidence interval for the mean.
+
+        Args:
+            confidence (float, optional): Confidence level. Defaults to 0.95.
+
+        Returns:
+            Tuple[float, float]: `(lo, hi)` interval bounds.
+        """
+        half_width = self.half_width(confidence=confidence)
+        return self.mean - half_width, self.mean + half_width
+
+    def __str__(self) -> str:
+        lo, hi = self.confidence_interval()
+        return (
+            f"RunningStats[n={self.count}, mean={self.mean}, stdev={self.stdev}, "
+            f"stderr={self.stderr}, 95% CI=({lo}, {hi}), min={self.min}, max={self.max}]"
+        )
+
+    def __repr__(self) -> str:
+        return str(self)
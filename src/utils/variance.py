@@ -0,0 +1,290 @@
+import math
+
+import numpy as np
+
+from typing import Callable, List, NamedTuple, Optional, Sequence, Tuple
+
+from .sim import BatchTrialFn
+from .stats import RunningStats
+
+
+# experiment written as a function of uniforms: (n, dims) array in [0, 1)^dims -> (n,) outcomes
+UniformFn = Callable[[np.ndarray], np.ndarray]
+
+METHODS = ["plain", "antithetic", "stratified", "lhs", "control"]
+
+
+def antithetic_uniforms(rng: np.random.Generator, n: int, dims: int) -> np.ndarray:
+    """Draw `n` antithetic pairs: rows `i` and `n + i` are `u` and `1 - u`.
+
+    Args:
+        rng (np.random.Generator): Source of randomness.
+        n (int): Number of pairs.
+        dims (int): Dimension of each point.
+
+    Returns:
+        np.ndarray: `(2n, dims)` array of uniforms.
+    """
+    u = rng.random((n, dims))
+    return np.concatenate([u, 1 - u])
+
+
+def latin_hypercube(rng: np.random.Generator, n: int, dims: int) -> np.ndarray:
+    """Draw a Latin hypercube design: along every axis, each of the `n` equal strata holds exactly one point.
+
+    Args:
+        rng (np.random.Generator): Source of randomness.
+        n (int): Number of points.
+        dims (int): Dimension of each point.
+
+    Returns:
+        np.ndarray: `(n, dims)` array of uniforms.
+    """
+    strata = rng.permuted(np.tile(np.arange(n), (dims, 1)), axis=1).T
+    return (strata + rng.random((n, dims))) / n
+
+
+def stratified_uniforms(rng: np.random.Generator, n: int, dims: int) -> np.ndarray:
+    """Draw one point in each cell of an `m^dims` grid (`m^dims <= n` maximal), topped up with plain uniforms.
+    Every point is still marginally uniform, so plain averages stay unbiased.
+
+    Args:
+        rng (np.random.Generator): Source of randomness.
+        n (int): Number of points.
+        dims (int): Dimension of each point.
+
+    Returns:
+        np.ndarray: `(n, dims)` array of uniforms.
+    """
+    m = int(round(n ** (1 / dims)))
+    while m**dims > n:
+        m -= 1
+    cells = np.indices((m,) * dims).reshape(dims, -1).T
+    stratified = (cells + rng.random((len(cells), dims))) / m
+    return np.concatenate([stratified, rng.random((n - len(cells), dims))])
+
+
+def _scale_to_bounds(
+    u: np.ndarray, x_bd: Tuple[int, int], y_bd: Tuple[int, int]
+) -> Tuple[np.ndarray, np.ndarray]:
+    (x_min, x_max), (y_min, y_max) = x_bd, y_bd
+    return x_min + u[:, 0] * (x_max - x_min), y_min + u[:, 1] * (y_max - y_min)
+
+
+def choose_points_stratified(
+    rng: np.random.Generator,
+    n: int,
+    x_bd: Optional[Tuple[int, int]] = (0, 1),
+    y_bd: Optional[Tuple[int, int]] = (0, 1),
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Stratified (jittered grid) version of `choose_points`.
+
+    @see `utils.sim.choose_points()`, `stratified_uniforms()`
+    """
+    return _scale_to_bounds(
+        u=stratified_uniforms(rng=rng, n=n, dims=2), x_bd=x_bd, y_bd=y_bd
+    )
+
+
+def choose_points_lhs(
+    rng: np.random.Generator,
+    n: int,
+    x_bd: Optional[Tuple[int, int]] = (0, 1),
+    y_bd: Optional[Tuple[int, int]] = (0, 1),
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Latin hypercube version of `choose_points`.
+
+    @see `utils.sim.choose_points()`, `latin_hypercube()`
+    """
+    return _scale_to_bounds(
+        u=latin_hypercube(rng=rng, n=n, dims=2), x_bd=x_bd, y_bd=y_bd
+    )
+
+
+def antithetic_batch_fn(f: UniformFn, dims: int) -> BatchTrialFn:
+    """Wrap `f` as a batched trial runnable whose every trial is the average of an antithetic pair.
+    Each trial costs two evaluations of `f`.
+
+    Args:
+        f (Callable[[np.ndarray], np.ndarray]): Experiment as a function of `(n, dims)` uniforms.
+        dims (int): Dimension of uniforms consumed per evaluation.
+
+    Returns:
+        Callable[[np.random.Generator, int], np.ndarray]: Batched trial runnable for `utils.sim`.
+    """
+
+    def batch_fn(rng: np.random.Generator, size: int) -> np.ndarray:
+        y = np.asarray(f(antithetic_uniforms(rng=rng, n=size, dims=dims)), dtype=float)
+        return (y[:size] + y[size:]) / 2
+
+    return batch_fn
+
+
+def lhs_batch_fn(f: UniformFn, dims: int) -> BatchTrialFn:
+    """Wrap `f` as a batched trial runnable drawing each batch as one Latin hypercube design.
+    Trials within a batch are negatively correlated, so per-trial standard errors are conservative.
+
+    Args:
+        f (Callable[[np.ndarray], np.ndarray]): Experiment as a function of `(n, dims)` uniforms.
+        dims (int): Dimension of uniforms consumed per evaluation.
+
+    Returns:
+        Callable[[np.random.Generator, int], np.ndarray]: Batched trial runnable for `utils.sim`.
+    """
+    return lambda rng, size: f(latin_hypercube(rng=rng, n=size, dims=dims))
+
+
+def control_variate_mean(
+    y: np.ndarray, controls: np.ndarray, control_means: Sequence[float]
+) -> Tuple[float, float]:
+    """Control-variate estimate of `E[y]`: subtract the least-squares fit of `y` on controls with known means.
+
+    Args:
+        y (np.ndarray): `(n,)` outcomes.
+        controls (np.ndarray): `(n,)` or `(n, k)` control values, correlated with `y`.
+        control_means (Sequence[float]): Known exact means of the `k` controls.
+
+    Returns:
+        Tuple[float, float]: (corrected estimate, factor by which residual variance is below `var(y)`).
+    """
+    y = np.asarray(y, dtype=float)
+    c = np.asarray(controls, dtype=float).reshape(len(y), -1)
+    c_centered = c - c.mean(axis=0)
+    beta, *_ = np.linalg.lstsq(c_centered, y - y.mean(), rcond=None)
+    residual = y - c_centered @ beta
+    estimate = float(y.mean() - (c.mean(axis=0) - np.asarray(control_means)) @ beta)
+    return estimate, float(y.var() / residual.var()) if residual.var() > 0 else math.inf
+
+
+def uniform_controls(u: np.ndarray) -> np.ndarray:
+    """Known-mean control helper: the driving uniforms themselves, each with exact mean `1/2`.
+    Pair with `control_means=uniform_control_means(dims)`.
+    """
+    return u
+
+
+def uniform_control_means(dims: int) -> List[float]:
+    return [0.5] * dims
+
+
+def estimate_mean(
+    f: UniformFn,
+    dims: int,
+    n: int,
+    rng: np.random.Generator,
+    method: Optional[str] = "plain",
+    controls: Optional[Callable[[np.ndarray], np.ndarray]] = uniform_controls,
+    control_means: Optional[Sequence[float]] = None,
+) -> float:
+    """Estimate `E[f(U)]` from `n` evaluations of `f` using one of `METHODS`.
+
+    Args:
+        f (Callable[[np.ndarray], np.ndarray]): Experiment as a function of `(n, dims)` uniforms.
+        dims (int): Dimension of uniforms consumed per evaluation.
+        n (int): Number of evaluations of `f` (rounded down to even for `"antithetic"`).
+        rng (np.random.Generator): Source of randomness.
+        method (Optional[str], optional): One of `METHODS`. Defaults to `"plain"`.
+        controls (Optional[Callable[[np.ndarray], np.ndarray]], optional): For `"control"`, map from uniforms
+         to control values. Defaults to `uniform_controls`.
+        control_means (Optional[Sequence[float]], optional): For `"control"`, exact means of `controls`.
+         Defaults to `uniform_control_means(dims)`.
+
+    Returns:
+        float: Unbiased (`"control"`: asymptotically unbiased) estimate of the mean.
+    """
+    if method == "plain":
+        return float(np.mean(f(rng.random((n, dims)))))
+    if method == "antithetic":
+        return float(np.mean(f(antithetic_uniforms(rng=rng, n=n // 2, dims=dims))))
+    if method == "stratified":
+        return float(np.mean(f(stratified_uniforms(rng=rng, n=n, dims=dims))))
+    if method == "lhs":
+        return float(np.mean(f(latin_hypercube(rng=rng, n=n, dims=dims))))
+    if method == "control":
+        u = rng.random((n, dims))
+        if control_means is None:
+            control_means = uniform_control_means(dims)
+        estimate, _ = control_variate_mean(
+            y=f(u), controls=controls(u), control_means=control_means
+        )
+        return estimate
+    raise ValueError(f"unknown method={method}, expected one of {METHODS}")
+
+
+class VarianceReport(NamedTuple):
+    method: str
+    estimate: float
+    stderr: float
+    variance_reduction: float
+
+
+def compare_variance_reduction(
+    f: UniformFn,
+    dims: int,
+    n: int,
+    replicates: Optional[int] = 100,
+    methods: Optional[Sequence[str]] = METHODS,
+    seed: Optional[int] = None,
+    res_map: Optional[Callable[[float], float]] = lambda x: x,
+    controls: Optional[Callable[[np.ndarray], np.ndarray]] = uniform_controls,
+    control_means: Optional[Sequence[float]] = None,
+    verbose: Optional[bool] = True,
+) -> List[VarianceReport]:
+    """Measure each method's estimator variance over `replicates` independent runs of `n` evaluations,
+    against plain sampling at the same cost. A `variance_reduction` of `r` means plain sampling
+    needs about `r` times as many evaluations for the same precision.
+
+    Args:
+        f (Callable[[np.ndarray], np.ndarray]): Experiment as a function of `(n, dims)` uniforms.
+        dims (int): Dimension of uniforms consumed per evaluation.
+        n (int): Evaluations of `f` per replicate.
+        replicates (Optional[int], optional): Independent replicates per method. Defaults to 100.
+        methods (Optional[Sequence[str]], optional): Methods to compare. Defaults to `METHODS`.
+        seed (Optional[int], optional): Seed for the `np.random.Generator`. Defaults to unseeded.
+        res_map (Optional[Callable[[float], float]], optional): Map applied to each replicate's estimate. Defaults to identity.
+        controls (Optional[Callable[[np.ndarray], np.ndarray]], optional): @see `estimate_mean()`.
+        control_means (Optional[Sequence[float]], optional): @see `estimate_mean()`.
+        verbose (Optional[bool], optional): Print one line per method. Defaults to `True`.
+
+    Returns:
+        List[VarianceReport]: (method, mean estimate, stderr of mean estimate, variance reduction vs plain) per method.
+    """
+    rng = np.random.default_rng(seed)
+    all_methods = ["plain"] + [m for m in methods if m != "plain"]
+    method_stats = {method: RunningStats() for method in all_methods}
+    for _ in range(replicates):
+        for method in all_methods:
+            method_stats[method].update(
+                res_map(
+                    estimate_mean(
+                        f=f,
+                        dims=dims,
+                        n=n,
+                        rng=rng,
+                        method=method,
+                        controls=controls,
+                        control_means=control_means,
+                    )
+                )
+            )
+
+    plain_var = method_stats["plain"].variance
+    reports = [
+        VarianceReport(
+            method=method,
+            estimate=stats.mean,
+            stderr=stats.stderr,
+            variance_reduction=plain_var / stats.variance
+            if stats.variance > 0
+            else math.inf,
+        )
+        for method, stats in method_stats.items()
+        if method in methods
+    ]
+    if verbose:
+        for report in reports:
+            print(
+                f"{report.method}: estimate={report.estimate}, stderr={report.stderr}, "
+                f"variance_reduction={report.variance_reduction:.2f}x"
+            )
+    return reports